@@ -1,3 +1,5 @@
+# Must be imported before src.pipeline loads tesserocr (see the module docstring)
+import src.ocr.openmp  # noqa: F401
 import os
 import uuid
 import yaml
@@ -23,6 +25,7 @@ from src.api.schemas import DocumentResponse, ProcessingResult, CorrectionReques
 from src.pipeline import DocumentProcessor
 from src.database.db import get_db, init_db, CRUD, SessionLocal, ProcessedDocument
 from src.extraction.hybrid_extractor import HybridExtractor 
+from src.extraction.spacy_extractor import select_spacy_device
 
 # Configure Logging
 logging.basicConfig(level=logging.INFO)
@@ -57,6 +60,8 @@ app.add_middleware(
 )
 
 processor = DocumentProcessor()
+# spaCy's device is process-wide: pick it once, before any extractor loads a model
+select_spacy_device()
 try:
     processor.extractor = HybridExtractor()
     logger.info("Swapped default extractor with HybridExtractor.")
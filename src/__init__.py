@@ -0,0 +1,5 @@
+import logging
+
+# Library modules never configure logging themselves; the application entry
+# point (e.g. main.py) decides handlers and levels for the root logger.
+logging.getLogger(__name__).addHandler(logging.NullHandler())
@@ -2,8 +2,6 @@ import logging
 import re
 from typing import Dict, Any, List, Tuple
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class RuleBasedClassifier:
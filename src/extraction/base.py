@@ -2,8 +2,6 @@ from abc import ABC, abstractmethod
 from typing import Dict, Any, List, Optional
 import logging
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class BaseExtractor(ABC):
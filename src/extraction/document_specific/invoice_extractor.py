@@ -7,6 +7,13 @@ from src.extraction.spacy_extractor import SpacyExtractor
 
 logger = logging.getLogger(__name__)
 
+# Line-item table markers. Both are plain words, so they are matched with
+# substring/startswith checks on the lowercased line instead of a regex.
+# A line containing any header word starts (or restarts) the table
+_ITEM_HEADER_WORDS = ("description", "item", "qty", "quantity", "rate", "unit price", "amount", "total")
+# A table line starting with one of these ends it
+_ITEM_TOTALS_PREFIXES = ("subtotal", "total", "tax", "amount due")
+
 class InvoiceExtractor(BaseExtractor):
     """
     Specialized extractor for Invoices.
@@ -156,8 +163,6 @@ class InvoiceExtractor(BaseExtractor):
         items = []
         lines = text.split('\n')
         
-        # Common header keywords
-        header_pattern = r"(description|item|qty|quantity|rate|unit price|amount|total)"
         start_parsing = False
         
         # Simple row pattern: Description ... Qty ... Price ... Amount
@@ -169,13 +174,15 @@ class InvoiceExtractor(BaseExtractor):
             if not line:
                 continue
                 
-            if re.search(header_pattern, line, re.IGNORECASE):
+            lowered = line.lower()
+            # Common header keywords
+            if any(word in lowered for word in _ITEM_HEADER_WORDS):
                 start_parsing = True
                 continue
             
             if start_parsing:
                 # Stop if we hit totals
-                if re.match(r"(subtotal|total|tax|amount due)", line, re.IGNORECASE):
+                if lowered.startswith(_ITEM_TOTALS_PREFIXES):
                     break
                 
                 # Try to parse line
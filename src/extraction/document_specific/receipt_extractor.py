@@ -7,6 +7,27 @@ from src.extraction.spacy_extractor import SpacyExtractor
 
 logger = logging.getLogger(__name__)
 
+# Patterns compiled once at import rather than looked up on every call
+# Time: HH:MM:SS or HH:MM am/pm
+_TIME_RE = re.compile(r"(\d{1,2}:\d{2}(?::\d{2})?\s*(?:[aApP][mM])?)")
+# Receipt / Transaction #, often labeled "Rcpt#", "Trans#", "Invoice#", "Order#".
+# Use [ \t] to avoid matching across newlines (e.g. "receipt.\nThank")
+_RECEIPT_ID_RE = re.compile(r"(?i)\b(?:Rcpt|Receipt|Trans|Transaction|Trx|Order|Inv|Invoice)\b[ \t]*[:#.]+[ \t]*([A-Z0-9-]{4,})")
+_TERMINAL_ID_RE = re.compile(r"(?i)\b(?:Term|Terminal)\b[ \t]*[:#.]+[ \t]*([A-Z0-9]+)")
+# Item line ending with a price. Group 1: Desc, Group 2: Price, Group 3: Optional Tax Flag (T, F, etc)
+_ITEM_PRICE_RE = re.compile(r"^(.+?)\s+[\$]?([0-9]+\.\d{2})\s*([T]?[A-Z]?)?$")
+# Payment methods in priority order, each with its whole-word pattern
+_PAYMENT_METHODS = tuple(
+    (m, re.compile(r"\b" + re.escape(m) + r"\b", re.IGNORECASE))
+    for m in ["Visa", "MasterCard", "Amex", "American Express", "Discover", "Cash", "Credit Card", "Debit Card"]
+)
+# "***********1234" or "Acct: ... 1234"
+_CARD_LAST4_RE = re.compile(r"(?:Acct|Card|Ends)\s*[:#]?\s*[\*xX\.]+(\d{4})", re.IGNORECASE)
+_AUTH_CODE_RE = re.compile(r"(?i)\b(?:Auth|Approval)(?:[ \t]*Code)?\b[ \t]*[:#.]+[ \t]*([A-Z0-9]+)")
+_MEMBER_ID_RE = re.compile(r"(?:Member|Rewards)\s*(?:ID|#)?\s*[:]?\s*([0-9\-\s]{5,})", re.IGNORECASE)
+_POINTS_RE = re.compile(r"(?:Points|Balance)\s*[:]?\s*(\d+)", re.IGNORECASE)
+_TOTAL_RE = re.compile(r"(?i)\b(total|amount due|grand total)\b.*?[:\s]+[\$]?([0-9,]+\.\d{2})")
+
 class ReceiptExtractor(BaseExtractor):
     """
     Specialized extractor for Receipts.
@@ -114,22 +135,17 @@ class ReceiptExtractor(BaseExtractor):
             details["date"] = dates[0]
             
         # Time (Simple regex for HH:MM:SS or HH:MM am/pm)
-        time_pat = r"(\d{1,2}:\d{2}(?::\d{2})?\s*(?:[aApP][mM])?)"
-        time_match = re.search(time_pat, text)
+        time_match = _TIME_RE.search(text)
         if time_match:
             details["time"] = self._create_field(time_match.group(1), "time", 0.9, "regex")
             
         # Receipt / Transaction #
-        # Often labeled "Rcpt#", "Trans#", "Invoice#", "Order#"
-        # Use [ \t] to avoid matching across newlines (e.g. "receipt.\nThank")
-        id_pat = r"(?i)\b(?:Rcpt|Receipt|Trans|Transaction|Trx|Order|Inv|Invoice)\b[ \t]*[:#.]+[ \t]*([A-Z0-9-]{4,})"
-        id_match = re.search(id_pat, text)
+        id_match = _RECEIPT_ID_RE.search(text)
         if id_match:
              details["receipt_number"] = self._create_field(id_match.group(1), "string", 0.9, "regex")
              
         # Terminal ID
-        term_pat = r"(?i)\b(?:Term|Terminal)\b[ \t]*[:#.]+[ \t]*([A-Z0-9]+)"
-        term_match = re.search(term_pat, text)
+        term_match = _TERMINAL_ID_RE.search(text)
         if term_match:
             details["terminal_id"] = self._create_field(term_match.group(1), "string", 0.85, "regex")
             
@@ -159,10 +175,7 @@ class ReceiptExtractor(BaseExtractor):
             # We want to be careful not to match dates or phone numbers
             
             # Simple heuristic: Ends with a float like structure
-            price_pat = r"^(.+?)\s+[\$]?([0-9]+\.\d{2})\s*([T]?[A-Z]?)?$" 
-            # Group 1: Desc, Group 2: Price, Group 3: Optional Tax Flag (T, F, etc)
-            
-            match = re.search(price_pat, line_str)
+            match = _ITEM_PRICE_RE.search(line_str)
             if match:
                 desc = match.group(1).strip()
                 price = match.group(2)
@@ -186,10 +199,9 @@ class ReceiptExtractor(BaseExtractor):
         payment = {}
         
         # Payment Method
-        methods = ["Visa", "MasterCard", "Amex", "American Express", "Discover", "Cash", "Credit Card", "Debit Card"]
         found_method = None
-        for m in methods:
-            if re.search(r"\b" + re.escape(m) + r"\b", text, re.IGNORECASE):
+        for m, method_re in _PAYMENT_METHODS:
+            if method_re.search(text):
                 found_method = m
                 break
         
@@ -197,15 +209,12 @@ class ReceiptExtractor(BaseExtractor):
             payment["method"] = self._create_field(found_method, "string", 0.9, "keyword_search")
             
         # Card Last 4
-        # "***********1234" or "Acct: ... 1234"
-        last4_pat = r"(?:Acct|Card|Ends)\s*[:#]?\s*[\*xX\.]+(\d{4})"
-        match = re.search(last4_pat, text, re.IGNORECASE)
+        match = _CARD_LAST4_RE.search(text)
         if match:
              payment["card_last_4"] = self._create_field(match.group(1), "string", 0.95, "regex")
              
         # Auth Code
-        auth_pat = r"(?i)\b(?:Auth|Approval)(?:[ \t]*Code)?\b[ \t]*[:#.]+[ \t]*([A-Z0-9]+)"
-        auth_match = re.search(auth_pat, text)
+        auth_match = _AUTH_CODE_RE.search(text)
         if auth_match:
             payment["auth_code"] = self._create_field(auth_match.group(1), "string", 0.9, "regex")
             
@@ -218,16 +227,14 @@ class ReceiptExtractor(BaseExtractor):
         loyalty = {}
         
         # Member number
-        mem_pat = r"(?:Member|Rewards)\s*(?:ID|#)?\s*[:]?\s*([0-9\-\s]{5,})" 
-        match = re.search(mem_pat, text, re.IGNORECASE)
+        match = _MEMBER_ID_RE.search(text)
         if match:
             # clean up spaces/dashes if strictly number
             val = match.group(1).strip()
             loyalty["member_id"] = self._create_field(val, "string", 0.8, "regex")
             
         # Points Balance
-        pts_pat = r"(?:Points|Balance)\s*[:]?\s*(\d+)"
-        pts_match = re.search(pts_pat, text, re.IGNORECASE)
+        pts_match = _POINTS_RE.search(text)
         if pts_match:
             loyalty["points_balance"] = self._create_field(pts_match.group(1), "number", 0.85, "regex")
             
@@ -237,8 +244,7 @@ class ReceiptExtractor(BaseExtractor):
         """
         Extract Total Amount explicitly.
         """
-        total_pat = r"(?i)\b(total|amount due|grand total)\b.*?[:\s]+[\$]?([0-9,]+\.\d{2})"
-        matches = re.findall(total_pat, text)
+        matches = _TOTAL_RE.findall(text)
         if matches:
             # Usually the last total on the receipt is the grand total
             val_str = matches[-1][1].replace(',', '')
@@ -7,6 +7,21 @@ from src.extraction.spacy_extractor import SpacyExtractor
 
 logger = logging.getLogger(__name__)
 
+# Common section headers, compiled once at import
+_SECTION_HEADERS = {
+    "Education": re.compile(r"(?i)\b(Education|Academic Background|Qualifications)\b"),
+    "Experience": re.compile(r"(?i)\b(Experience|Work Experience|Employment|History|Professional Experience)\b"),
+    "Skills": re.compile(r"(?i)\b(Skills|Technical Skills|Competencies|Abilities|Technologies)\b"),
+    "Certifications": re.compile(r"(?i)\b(Certifications|Certificates|Awards|Honors)\b"),
+    "Projects": re.compile(r"(?i)\b(Projects|Portfolio)\b")
+}
+
+# Degree keyword followed by its qualifiers, e.g. "Bachelor of Science", "Master in X".
+# Flatter structure: Degree + (space + keyword)*
+_DEGREE_RE = re.compile(r"(?i)\b(?:B\.?S\.?|B\.?A\.?|M\.?S\.?|M\.?A\.?|Ph\.?D\.?|Bachelor|Master|Doctor|Diploma|Certificate|Associate)(?:\s+(?:of|in|to|Science|Arts|Engineering|Business|Technology|Management|Education|Philosophy|Computer))+\b")
+
+_YEAR_RE = re.compile(r"\b(19|20)\d{2}\b")
+
 class ResumeExtractor(BaseExtractor):
     """
     Specialized extractor for Resumes/CVs.
@@ -59,19 +74,10 @@ class ResumeExtractor(BaseExtractor):
         """
         sections = {}
         
-        # Common headers
-        headers = {
-            "Education": r"(?i)\b(Education|Academic Background|Qualifications)\b",
-            "Experience": r"(?i)\b(Experience|Work Experience|Employment|History|Professional Experience)\b",
-            "Skills": r"(?i)\b(Skills|Technical Skills|Competencies|Abilities|Technologies)\b",
-            "Certifications": r"(?i)\b(Certifications|Certificates|Awards|Honors)\b",
-            "Projects": r"(?i)\b(Projects|Portfolio)\b"
-        }
-        
         # Find indices of all headers
         found_indices = []
-        for section, pattern in headers.items():
-            for match in re.finditer(pattern, text):
+        for section, pattern in _SECTION_HEADERS.items():
+            for match in pattern.finditer(text):
                 # Heuristic: Header should be on its own line or start of line
                 # and usually short (less than 5 words)
                 line_start = text.rfind('\n', 0, match.start())
@@ -166,14 +172,12 @@ class ResumeExtractor(BaseExtractor):
             return []
             
         # Strategy: Look for degree keywords, then find Org (University) and Dates nearby
-        # Expanded pattern to capture "Bachelor of Science", "Master in X", etc.
-        # Flatter structure: Degree + (space + keyword)*
-        degree_patterns = r"(?i)\b(?:B\.?S\.?|B\.?A\.?|M\.?S\.?|M\.?A\.?|Ph\.?D\.?|Bachelor|Master|Doctor|Diploma|Certificate|Associate)(?:\s+(?:of|in|to|Science|Arts|Engineering|Business|Technology|Management|Education|Philosophy|Computer))+\b"
+        # Expanded pattern (_DEGREE_RE) captures "Bachelor of Science", "Master in X", etc.
         
         # We might want to iterate line by line or chunks?
         # Let's just create one entry per "Degree" found
         
-        for match in re.finditer(degree_patterns, text):
+        for match in _DEGREE_RE.finditer(text):
             # For each degree, define a window to find School and Date
             start, end = match.span()
             # Look ahead and behind a bit, or just take the line
@@ -207,12 +211,12 @@ class ResumeExtractor(BaseExtractor):
                         entry["institution"] = ents[0]
 
             # Find Year (####)
-            dates = re.findall(r"\b(19|20)\d{2}\b", line_content) # Simple year extraction
+            dates = _YEAR_RE.findall(line_content) # Simple year extraction
             if not dates:
                  # Check next line too
                  next_line_end = text.find('\n', line_end+1)
                  next_line = text[line_end:next_line_end] if next_line_end != -1 else ""
-                 dates = re.findall(r"\b(19|20)\d{2}\b", next_line)
+                 dates = _YEAR_RE.findall(next_line)
                  
             if dates:
                 # If multiple dates (start-end), typically the last one is grad year
@@ -4,8 +4,6 @@ from fuzzywuzzy import fuzz
 from src.extraction.regex_extractor import RegexExtractor
 from src.extraction.spacy_extractor import SpacyExtractor
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class HybridExtractor:
@@ -64,18 +62,19 @@ class HybridExtractor:
 
         # 2. Run SpaCy Extraction
         if self.spacy_extractor:
-            spacy_raw_entities = self.spacy_extractor.extract_entities(text)
-            spacy_companies = self.spacy_extractor.extract_company_names(text)
+            # One spaCy pipeline run covers persons, companies and skills
+            spacy_all = self.spacy_extractor.extract_all(text)
+            spacy_companies = spacy_all["company_names"]
             
             # Helper to flatten Spacy company dict
             all_companies = spacy_companies.get("vendor", []) + spacy_companies.get("customer", [])
             
             spacy_results = {
-                "person_name": self.spacy_extractor.extract_person_names(text),
+                "person_name": spacy_all["person_names"],
                 "company_name": all_companies,
                 "address": self.spacy_extractor.extract_addresses(text),
                 "job_title": self.spacy_extractor.extract_job_titles(text),
-                "skill": self.spacy_extractor.extract_skills(text)
+                "skill": spacy_all["skills"]
             }
         else:
             spacy_results = {}
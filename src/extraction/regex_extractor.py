@@ -4,8 +4,6 @@ from typing import List, Dict, Any, Optional
 from datetime import datetime
 import dateutil.parser
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class RegexExtractor:
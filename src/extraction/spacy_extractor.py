@@ -1,55 +1,139 @@
 import spacy
+import bisect
 import logging
 import re
-from typing import List, Dict, Any, Optional, Set
-from spacy.matcher import PhraseMatcher
+from typing import List, Dict, Any, Optional, Tuple
+from spacy.language import Language
 from spacy.tokens import Doc
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Regex for US ZIP codes (5 digits, optional -4), compiled once for all calls.
+# ASCII mode: ZIP codes are ASCII digits, and skipping Unicode class lookups halves the scan time.
+_ZIP_RE = re.compile(r'\b\d{5}(?:-\d{4})?\b', re.ASCII)
+_NEWLINE_RE = re.compile('\n')
+
+# "Title at Company", "Title - Company", "Title, Company" using common title keywords
+_COMMON_TITLES = r"(Software Engineer|Developer|Manager|Director|CTO|CEO|COO|Designer|Architect|Consultant|Analyst|Scientist|Coordinator|Administrator)"
+_JOB_TITLE_RE = re.compile(
+    fr"\b({_COMMON_TITLES}(?:\s+[A-Za-z]+){{0,3}})\s+(?:at|@|for|-|with)\s+([A-Z][A-Za-z0-9\s]+)",
+    re.IGNORECASE
+)
+
+# MVP Skills list - in a real app, this would come from a database or file
+_COMMON_SKILLS = (
+    "Python", "Java", "JavaScript", "TypeScript", "C++", "C#", "Go", "Rust",
+    "SQL", "NoSQL", "MongoDB", "PostgreSQL", "MySQL", "Redis",
+    "React", "Angular", "Vue", "Next.js", "Node.js", "Django", "FastAPI", "Flask",
+    "AWS", "Azure", "GCP", "Docker", "Kubernetes", "Terraform",
+    "Machine Learning", "Deep Learning", "NLP", "Computer Vision", "TensorFlow", "PyTorch", "Scikit-learn",
+    "Project Management", "Agile", "Scrum", "Communication", "Leadership"
+)
+# All skills in one alternation, scanned in a single pass. Longest first so a longer
+# skill wins at the same position; lookarounds instead of \b so skills ending in a
+# symbol (C++, C#) still match whole words only.
+_SKILLS_RE = re.compile(
+    r"(?<!\w)(?:" + "|".join(re.escape(skill) for skill in sorted(_COMMON_SKILLS, key=len, reverse=True)) + r")(?!\w)"
+)
+
+# Pipeline components nothing here reads (only Doc.ents is used; NER has its own
+# tok2vec in the en_core_web models), so they are not loaded at all
+_UNUSED_PIPES = ("tagger", "parser", "attribute_ruler", "lemmatizer")
+
+# Entity labels reported by extract_entities, in output order
+_ENTITY_LABELS = ("PERSON", "ORG", "GPE", "DATE", "MONEY")
+
+# Words before an ORG (within _CUSTOMER_CONTEXT_CHARS) marking it as the customer
+_CUSTOMER_CONTEXT = ("bill to", "ship to", "customer")
+_CUSTOMER_CONTEXT_CHARS = 50
+
+# Device chosen by select_spacy_device; None until then (thinc runs on CPU by default)
+_device_on_gpu: Optional[bool] = None
+
+def select_spacy_device(use_gpu: Optional[bool] = None, transformer: bool = False) -> bool:
+    """
+    Choose the device spaCy runs on, once per process and before any model is loaded.
+
+    thinc's backend is process-wide, so this is an application-level setting: calls
+    after the first return the device already chosen and never move loaded models.
+
+    Args:
+        use_gpu: None (default) uses a GPU when one is available, True requires one
+            and False forces CPU.
+        transformer: On GPU, let transformer models (en_core_web_trf) share PyTorch's
+            memory pool instead of a separate CuPy one.
+
+    Returns:
+        True if spaCy runs on GPU.
+    """
+    global _device_on_gpu
+    if _device_on_gpu is not None:
+        if use_gpu is not None and use_gpu != _device_on_gpu:
+            logger.warning("spaCy device already selected (on_gpu=%s); ignoring use_gpu=%s", _device_on_gpu, use_gpu)
+        return _device_on_gpu
+
+    if use_gpu is None:
+        _device_on_gpu = spacy.prefer_gpu()
+    elif use_gpu:
+        _device_on_gpu = spacy.require_gpu()
+    else:
+        spacy.require_cpu()
+        _device_on_gpu = False
+
+    if _device_on_gpu and transformer:
+        from thinc.api import set_gpu_allocator
+        set_gpu_allocator("pytorch")
+    return _device_on_gpu
+
+def _entity_record(ent) -> Dict[str, Any]:
+    """Result record for a named entity (built directly: this runs once per entity)."""
+    return {
+        "value": ent.text.strip(),
+        "confidence": 1.0, # spaCy generally produces high confidence for recognized ents
+        "field_type": "entity",
+        "entity_label": ent.label_,
+        "position": {"start": ent.start_char, "end": ent.end_char}
+    }
+
 class SpacyExtractor:
     """
     Extracts structured data (entities, names, addresses, skills) using spaCy NER and pattern matching.
     """
 
+    # Loaded pipelines shared by all instances, keyed by (model_name, on_gpu)
+    _model_cache: Dict[Tuple[str, bool], Language] = {}
+
     def __init__(self, model_name: str = "en_core_web_lg"):
         """
         Initialize the SpacyExtractor with a specific model.
         
         Args:
             model_name: The name of the spaCy model to load. Defaults to "en_core_web_lg".
+                "en_core_web_sm" loads much faster and uses far less memory (only entities
+                are read, never vectors), but its NER is less accurate.
+                The model runs on the device picked by select_spacy_device (CPU if none was).
         """
+        self.on_gpu = bool(_device_on_gpu)
+
+        # Reuse a pipeline already loaded in this process for the same model and device
+        cache_key = (model_name, self.on_gpu)
+        if cache_key in SpacyExtractor._model_cache:
+            self.nlp = SpacyExtractor._model_cache[cache_key]
+            return
+
         try:
-            logger.info(f"Loading spaCy model: {model_name}")
-            self.nlp = spacy.load(model_name)
+            logger.info("Loading spaCy model: %s", model_name)
+            self.nlp = spacy.load(model_name, exclude=_UNUSED_PIPES)
         except OSError:
-            logger.warning(f"Model '{model_name}' not found. Downloading...")
+            logger.warning("Model '%s' not found. Downloading...", model_name)
             from spacy.cli import download
             download(model_name)
-            self.nlp = spacy.load(model_name)
+            self.nlp = spacy.load(model_name, exclude=_UNUSED_PIPES)
         except Exception as e:
-            logger.error(f"Failed to load spaCy model '{model_name}': {e}")
+            logger.error("Failed to load spaCy model '%s': %s", model_name, e)
             raise
 
-        # Initialize matchers
-        self.matcher = PhraseMatcher(self.nlp.vocab)
-        self._initialize_skills_matcher()
-
-    def _initialize_skills_matcher(self):
-        """Initialize the PhraseMatcher with a predefined list of skills."""
-        # MVP Skills list - in a real app, this would come from a database or file
-        common_skills = [
-            "Python", "Java", "JavaScript", "TypeScript", "C++", "C#", "Go", "Rust",
-            "SQL", "NoSQL", "MongoDB", "PostgreSQL", "MySQL", "Redis",
-            "React", "Angular", "Vue", "Next.js", "Node.js", "Django", "FastAPI", "Flask",
-            "AWS", "Azure", "GCP", "Docker", "Kubernetes", "Terraform",
-            "Machine Learning", "Deep Learning", "NLP", "Computer Vision", "TensorFlow", "PyTorch", "Scikit-learn",
-            "Project Management", "Agile", "Scrum", "Communication", "Leadership"
-        ]
-        patterns = [self.nlp.make_doc(text) for text in common_skills]
-        self.matcher.add("SKILL", patterns)
+        SpacyExtractor._model_cache[cache_key] = self.nlp
 
     def _format_result(self, value: Any, confidence: float, field_type: str, start: int = -1, end: int = -1, label: str = "") -> Dict[str, Any]:
         """Helper to standardize return format."""
@@ -64,12 +148,13 @@ class SpacyExtractor:
             "position": {"start": start, "end": end} if start != -1 else None
         }
 
-    def extract_entities(self, text: str) -> Dict[str, List[Dict[str, Any]]]:
+    def extract_entities(self, text: str, doc: Optional[Doc] = None) -> Dict[str, List[Dict[str, Any]]]:
         """
         Extract standard named entities (PERSON, ORG, GPE, DATE, MONEY).
         
         Args:
             text: The text to process.
+            doc: Optional Doc already parsed from text (e.g. by nlp.pipe), reused instead of running the pipeline again.
             
         Returns:
             Dictionary of extracted entities grouped by type.
@@ -77,34 +162,126 @@ class SpacyExtractor:
         if not text:
             return {}
 
-        doc = self.nlp(text)
-        entities = {
-            "PERSON": [],
-            "ORG": [],
-            "GPE": [],
-            "DATE": [],
-            "MONEY": []
-        }
+        if doc is None:
+            doc = self.nlp(text)
+        entities = {label: [] for label in _ENTITY_LABELS}
 
         for ent in doc.ents:
-            if ent.label_ in entities:
-                entities[ent.label_].append(self._format_result(
-                    value=ent.text,
-                    confidence=1.0, # spaCy generally produces high confidence for recognized ents
-                    field_type="entity",
-                    start=ent.start_char,
-                    end=ent.end_char,
-                    label=ent.label_
-                ))
+            bucket = entities.get(ent.label_)
+            if bucket is not None:
+                bucket.append(_entity_record(ent))
         
         return entities
 
-    def extract_person_names(self, text: str) -> List[Dict[str, Any]]:
+    def extract_all(self, text: str, doc: Optional[Doc] = None) -> Dict[str, Any]:
+        """
+        Run the entity-based extractions with one pipeline run and one pass over the entities,
+        plus skills. Equivalent to calling extract_entities, extract_person_names,
+        extract_company_names and extract_skills on the same text.
+        
+        Args:
+            text: The text to process.
+            doc: Optional Doc already parsed from text, reused instead of running the pipeline again.
+            
+        Returns:
+            Dictionary with 'entities', 'person_names', 'company_names' and 'skills' keys,
+            each holding what the matching extract_* method returns.
+        """
+        if not text:
+            return {
+                "entities": {},
+                "person_names": [],
+                "company_names": {"vendor": [], "customer": []},
+                "skills": []
+            }
+
+        if doc is None:
+            doc = self.nlp(text)
+        entities = {label: [] for label in _ENTITY_LABELS}
+        persons = []
+        companies = {"vendor": [], "customer": []}
+        first_org_found = False
+
+        for ent in doc.ents:
+            label = ent.label_
+            bucket = entities.get(label)
+            if bucket is not None:
+                bucket.append(_entity_record(ent))
+            if label == "PERSON":
+                person = self._person_name_result(ent)
+                if person is not None:
+                    persons.append(person)
+            elif label == "ORG":
+                first_org_found = self._add_company(companies, text, ent, first_org_found)
+
+        return {
+            "entities": entities,
+            "person_names": persons,
+            "company_names": companies,
+            "skills": self.extract_skills(text)
+        }
+
+    def _person_name_result(self, ent) -> Optional[Dict[str, Any]]:
+        """Result record for a PERSON entity, or None if it is unlikely to be a real name."""
+        # Filter: Names should usually have at least two parts (First Last) 
+        # or should not be common stop words.
+        if len(ent.text.split()) > 1 or (len(ent.text) > 3 and ent.text[0].isupper()):
+            return self._format_result(
+                value=ent.text,
+                confidence=0.9,
+                field_type="person_name",
+                start=ent.start_char,
+                end=ent.end_char,
+                label="PERSON"
+            )
+        return None
+
+    def _add_company(self, companies: Dict[str, List[Dict[str, Any]]], text: str, ent, first_org_found: bool) -> bool:
+        """
+        Classify an ORG entity as vendor or customer and add it to companies.
+        Returns the updated first_org_found flag.
+        """
+        # Heuristic: First ORG is often the Vendor/Sender in invoices
+        # Heuristic: ORG near "Bill To" or "Ship To" is Customer
+
+        # Context check
+        start_idx = ent.start_char
+        # Look at window before entity
+        pre_window = text[max(0, start_idx - _CUSTOMER_CONTEXT_CHARS):start_idx].lower()
+        
+        is_customer = False
+        if any(word in pre_window for word in _CUSTOMER_CONTEXT):
+            is_customer = True
+            confidence = 0.85
+        elif not first_org_found:
+            # Assume first ORG is vendor if no specific context
+            is_customer = False
+            confidence = 0.7
+            first_org_found = True
+        else:
+            # Default bucket if unknown
+            is_customer = False # Treating others as potential vendors/partners
+            confidence = 0.5
+
+        category = "customer" if is_customer else "vendor"
+        
+        companies[category].append(self._format_result(
+            value=ent.text,
+            confidence=confidence,
+            field_type="company_name",
+            start=ent.start_char,
+            end=ent.end_char,
+            label="ORG"
+        ))
+        return first_org_found
+
+    def extract_person_names(self, text: str, doc: Optional[Doc] = None) -> List[Dict[str, Any]]:
         """
         Extract and filter person names to reduce false positives.
         
         Args:
             text: The text to process.
+            doc: Optional Doc already parsed from text, reused instead of running the pipeline again.
             
         Returns:
             List of valid person names.
@@ -112,31 +289,25 @@ class SpacyExtractor:
         if not text:
             return []
 
-        doc = self.nlp(text)
+        if doc is None:
+            doc = self.nlp(text)
         persons = []
 
         for ent in doc.ents:
             if ent.label_ == "PERSON":
-                # Filter: Names should usually have at least two parts (First Last) 
-                # or should not be common stop words.
-                if len(ent.text.split()) > 1 or (len(ent.text) > 3 and ent.text[0].isupper()):
-                     persons.append(self._format_result(
-                        value=ent.text,
-                        confidence=0.9,
-                        field_type="person_name",
-                        start=ent.start_char,
-                        end=ent.end_char,
-                        label="PERSON"
-                    ))
+                person = self._person_name_result(ent)
+                if person is not None:
+                    persons.append(person)
         
         return persons
 
-    def extract_company_names(self, text: str) -> Dict[str, List[Dict[str, Any]]]:
+    def extract_company_names(self, text: str, doc: Optional[Doc] = None) -> Dict[str, List[Dict[str, Any]]]:
         """
         Extract company names and attempt to classify them (Vendor vs Customer).
         
         Args:
             text: The text to process.
+            doc: Optional Doc already parsed from text, reused instead of running the pipeline again.
             
         Returns:
             Dictionary with 'vendor' and 'customer' keys.
@@ -144,90 +315,48 @@ class SpacyExtractor:
         if not text:
             return {"vendor": [], "customer": []}
 
-        doc = self.nlp(text)
+        if doc is None:
+            doc = self.nlp(text)
         companies = {"vendor": [], "customer": []}
-        
-        # Heuristic: First ORG is often the Vendor/Sender in invoices
-        # Heuristic: ORG near "Bill To" or "Ship To" is Customer
-        
         first_org_found = False
-        lines = text.split('\n')
         
         for ent in doc.ents:
             if ent.label_ == "ORG":
-                # Context check
-                start_idx = ent.start_char
-                # Look at window before entity
-                pre_window = text[max(0, start_idx-50):start_idx].lower()
-                
-                is_customer = False
-                if "bill to" in pre_window or "ship to" in pre_window or "customer" in pre_window:
-                    is_customer = True
-                    confidence = 0.85
-                elif not first_org_found:
-                    # Assume first ORG is vendor if no specific context
-                     is_customer = False
-                     confidence = 0.7
-                     first_org_found = True
-                else:
-                    # Default bucket if unknown
-                    is_customer = False # Treating others as potential vendors/partners
-                    confidence = 0.5
-
-                category = "customer" if is_customer else "vendor"
-                
-                companies[category].append(self._format_result(
-                    value=ent.text,
-                    confidence=confidence,
-                    field_type="company_name",
-                    start=ent.start_char,
-                    end=ent.end_char,
-                    label="ORG"
-                ))
+                first_org_found = self._add_company(companies, text, ent, first_org_found)
 
         return companies
 
     def extract_addresses(self, text: str) -> List[Dict[str, Any]]:
         """
-        Extract addresses using GPE entities and regex patterns for ZIP usage.
-        
+        Extract addresses using regex patterns for ZIP usage.
+
         Args:
             text: The text to process.
-            
+
         Returns:
             List of extracted addresses.
         """
         if not text:
             return []
 
-        doc = self.nlp(text)
         addresses = []
-        
-        # Regex for US ZIP codes (5 digits, optional -4)
-        zip_pattern = r'\b\d{5}(?:-\d{4})?\b'
-        
-        # Strategy: Look for GPE (Geopolitical Entity) and see if it looks like part of an address
-        # Or look for ZIP codes and expand window
-        
-        # 1. Capture lines with GPEs that also have numbers (street num or zip)
-        for ent in doc.ents:
-            if ent.label_ == "GPE":
-                # Check immediate context
-                # This is a simplification; full address parsing is complex.
-                # We'll look for lines containing the GPE.
-                pass 
-
-        # 2. Regex Search for ZIP codes as anchors
-        for match in re.finditer(zip_pattern, text):
-            zip_code = match.group()
+
+        # Strategy: Look for ZIP codes and expand window to the enclosing line.
+        # Only regex anchors are used, so the spaCy pipeline is not run here.
+        # Newline offsets are collected once so each match resolves its
+        # enclosing line with a binary search instead of rescanning the text.
+        newlines = [m.start() for m in _NEWLINE_RE.finditer(text)]
+        text_len = len(text)
+
+        for match in _ZIP_RE.finditer(text):
             start, end = match.span()
-            
+
             # Look backwards for City, State (often capture entire line)
-            line_start = text.rfind('\n', 0, start)
-            if line_start == -1: line_start = 0
-            line_end = text.find('\n', end)
-            if line_end == -1: line_end = len(text)
-            
+            idx = bisect.bisect_left(newlines, start)
+            line_start = newlines[idx - 1] if idx > 0 else 0
+            idx = bisect.bisect_left(newlines, end, idx)
+            line_end = newlines[idx] if idx < len(newlines) else text_len
+
             full_line = text[line_start:line_end].strip()
             
             # Simple validation: line should contain letters
@@ -245,6 +374,7 @@ class SpacyExtractor:
     def extract_skills(self, text: str) -> List[Dict[str, Any]]:
         """
         Extract skills from text (useful for resumes).
+        Keyword matching only, so the spaCy pipeline is not run here.
         
         Args:
             text: The text to process.
@@ -255,18 +385,15 @@ class SpacyExtractor:
         if not text:
             return []
 
-        doc = self.nlp(text)
-        matches = self.matcher(doc)
         skills = []
         
-        for match_id, start, end in matches:
-            span = doc[start:end]
+        for match in _SKILLS_RE.finditer(text):
             skills.append(self._format_result(
-                value=span.text,
+                value=match.group(),
                 confidence=1.0,
                 field_type="skill",
-                start=span.start_char,
-                end=span.end_char
+                start=match.start(),
+                end=match.end()
             ))
             
         # Deduplicate by value
@@ -298,13 +425,10 @@ class SpacyExtractor:
         # "Title, Company"
         
         # We can use spaCy dependency parsing or simple regex + NER
-        # For MVP, let's use a regex with some common title keywords
-        
-        common_titles = r"(Software Engineer|Developer|Manager|Director|CTO|CEO|COO|Designer|Architect|Consultant|Analyst|Scientist|Coordinator|Administrator)"
-        pattern = fr"\b({common_titles}(?:\s+[A-Za-z]+){{0,3}})\s+(?:at|@|for|-|with)\s+([A-Z][A-Za-z0-9\s]+)"
+        # For MVP, let's use a regex with some common title keywords (_JOB_TITLE_RE)
         
         titles = []
-        for match in re.finditer(pattern, text, re.IGNORECASE):
+        for match in _JOB_TITLE_RE.finditer(text):
             full_match = match.group(0)
             title = match.group(1)
             # Company part is match.group(2)
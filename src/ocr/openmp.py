@@ -0,0 +1,14 @@
+"""
+Process-wide OpenMP limit for the tesserocr backend.
+
+tesserocr's OpenMP runtime reads OMP_THREAD_LIMIT once, when it is loaded, so the limit
+cannot be set per engine. Importing this module before anything imports tesserocr (first
+thing in an application entry point) defaults it to one thread, so the pipeline's parallel
+page workers do not compete for cores. Without tesserocr the environment is left alone:
+the pytesseract backend sets the limit per tesseract process (see TesseractEngine).
+"""
+import importlib.util
+import os
+
+if importlib.util.find_spec("tesserocr") is not None:
+    os.environ.setdefault("OMP_THREAD_LIMIT", "1")
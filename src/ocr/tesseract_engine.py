@@ -1,29 +1,218 @@
+import errno
+import io
 import logging
+import os
+import queue
+import shlex
+import subprocess
+import threading
 import time
 import pytesseract
 from PIL import Image
 import numpy as np
-from typing import Dict, Any, Union, List
+from typing import Dict, Any, Union, List, Optional, Tuple
+
+try:
+    import tesserocr
+except ImportError:
+    # Optional: without it every call runs the tesseract binary through pytesseract
+    tesserocr = None
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Column order of Tesseract's TSV output (same keys as pytesseract.image_to_data)
+_TSV_COLUMNS = (
+    "level", "page_num", "block_num", "par_num", "line_num", "word_num",
+    "left", "top", "width", "height", "conf", "text"
+)
+
+def _tsv_to_data(tsv: str) -> Dict[str, List[Any]]:
+    """Parse Tesseract TSV output into a dict of columns, as pytesseract.image_to_data returns."""
+    data = {column: [] for column in _TSV_COLUMNS}
+    for row in tsv.splitlines():
+        if not row or row.startswith("level"):
+            # The tesseract binary writes a header row; tesserocr does not
+            continue
+        values = row.split("\t", len(_TSV_COLUMNS) - 1)
+        if len(values) < len(_TSV_COLUMNS):
+            values.append("")
+        for column, value in zip(_TSV_COLUMNS[:-2], values):
+            data[column].append(int(value))
+        data["conf"].append(float(values[-2]))
+        data["text"].append(values[-1])
+    return data
+
+# How long a thread waits for an idle tesserocr API before checking again whether
+# it may create one (a failed creation frees its slot without returning an API)
+_API_WAIT_SECONDS = 1.0
+
+class _ApiPool:
+    """
+    Idle tesserocr APIs for one engine configuration.
+    APIs are created on demand, up to the largest pool size any engine asked for.
+    """
+
+    def __init__(self):
+        self.idle = queue.LifoQueue()
+        self.created = 0
+        self.lock = threading.Lock()
+
 class TesseractEngine:
     """
-    Wrapper around Tesseract OCR (via pytesseract) for text extraction.
-    Requires Tesseract binary to be installed on the system.
+    Wrapper around Tesseract OCR for text extraction.
+    Uses an in-process tesserocr API when tesserocr is installed, otherwise pytesseract.
+    Requires Tesseract to be installed on the system.
     """
 
-    def __init__(self, languages: str = 'eng'):
+    # Pools of tesserocr APIs shared by all engines in this process, keyed by (languages, oem, psm)
+    _api_cache: Dict[Tuple[str, Optional[int], Optional[int]], _ApiPool] = {}
+    _api_cache_lock = threading.Lock()
+
+    def __init__(
+        self,
+        languages: str = 'eng',
+        oem: Optional[int] = None,
+        psm: Optional[int] = None,
+        pool_size: int = 1,
+        omp_thread_limit: Optional[int] = None,
+        timeout: float = 0
+    ):
         """
         Initialize Tesseract Engine.
         
         Args:
             languages: Tesseract language code (default 'eng'). Multiple can be joined by '+' (e.g. 'eng+fra').
+            oem: OCR engine mode. None keeps Tesseract's default.
+            psm: Page segmentation mode. None keeps Tesseract's default.
+            pool_size: Number of tesserocr APIs this engine may use at once, i.e. how many
+                threads can run OCR in parallel through it (tesserocr backend only). APIs are
+                shared by every engine with the same languages, oem and psm, so the shared
+                pool holds up to the largest pool_size among them.
+            omp_thread_limit: OpenMP threads per tesseract process (pytesseract backend only),
+                set in that process's environment. None inherits this process's environment.
+                tesserocr reads OMP_THREAD_LIMIT once, when it is imported, so for that
+                backend it must be set before the application starts.
+            timeout: Seconds a tesseract process may run before it is killed and a
+                RuntimeError raised, as in pytesseract (0, the default, waits indefinitely).
+                tesserocr runs in-process and cannot be interrupted.
         """
         self.languages = languages
-        logger.info(f"Initialized TesseractEngine with languages: {languages}")
+        self.oem = oem
+        self.psm = psm
+        self.pool_size = max(1, pool_size)
+        self.omp_thread_limit = omp_thread_limit
+        self.timeout = timeout
+
+        # tesserocr APIs are loaded on first use (see _acquire_api)
+        self._pool = None
+
+        config = []
+        if oem is not None:
+            config.append(f"--oem {oem}")
+        if psm is not None:
+            config.append(f"--psm {psm}")
+        self._config = " ".join(config)
+
+        logger.info("Initialized TesseractEngine with languages: %s", languages)
+
+    def _get_pool(self) -> _ApiPool:
+        """Return the process-wide API pool for this engine's settings."""
+        if self._pool is None:
+            key = (self.languages, self.oem, self.psm)
+            with TesseractEngine._api_cache_lock:
+                self._pool = TesseractEngine._api_cache.setdefault(key, _ApiPool())
+        return self._pool
+
+    def _acquire_api(self) -> Any:
+        """
+        Take a tesserocr API for this engine's settings, waiting if all are in use.
+        APIs are shared by every engine with the same settings and loaded only when no
+        idle one is left, so creating more engines does not reload the traineddata.
+        """
+        pool = self._get_pool()
+        while True:
+            try:
+                return pool.idle.get_nowait()
+            except queue.Empty:
+                pass
+
+            with pool.lock:
+                create = pool.created < self.pool_size
+                if create:
+                    pool.created += 1
+            if create:
+                break
+            try:
+                return pool.idle.get(timeout=_API_WAIT_SECONDS)
+            except queue.Empty:
+                continue
+
+        api_kwargs = {}
+        if self.oem is not None:
+            api_kwargs["oem"] = self.oem
+        if self.psm is not None:
+            api_kwargs["psm"] = self.psm
+        logger.info("Loading tesserocr API for languages: %s", self.languages)
+        try:
+            return tesserocr.PyTessBaseAPI(lang=self.languages, **api_kwargs)
+        except Exception:
+            with pool.lock:
+                pool.created -= 1
+            raise
+
+    def _release_api(self, api: Any) -> None:
+        """Return an API taken with _acquire_api to the pool."""
+        self._get_pool().idle.put(api)
+
+    def _image_to_data(self, img_obj: Image.Image) -> Dict[str, List[Any]]:
+        """
+        Run Tesseract once and return word-level data as a dict of columns.
+        """
+        if tesserocr is None:
+            if self.omp_thread_limit is not None:
+                return _tsv_to_data(self._run_tesseract_tsv(img_obj))
+            return pytesseract.image_to_data(
+                img_obj, lang=self.languages, config=self._config,
+                output_type=pytesseract.Output.DICT, timeout=self.timeout
+            )
+
+        # Reused for every image: no process spawn or model reload per call.
+        # A PyTessBaseAPI is not thread-safe, so each thread takes its own from the pool.
+        api = self._acquire_api()
+        try:
+            api.SetImage(img_obj)
+            tsv = api.GetTSVText(0)
+        finally:
+            self._release_api(api)
+
+        return _tsv_to_data(tsv)
+
+    def _run_tesseract_tsv(self, img_obj: Image.Image) -> str:
+        """
+        Run the tesseract binary on an image with OMP_THREAD_LIMIT set for that process
+        only (pytesseract always passes this process's environment), and return its TSV.
+        Timeouts and failures raise the same errors as pytesseract.
+        """
+        png = io.BytesIO()
+        img_obj.save(png, format="PNG")
+        cmd = [pytesseract.pytesseract.tesseract_cmd, "stdin", "stdout", "-l", self.languages]
+        cmd += shlex.split(self._config)
+        cmd.append("tsv")
+        env = dict(os.environ, OMP_THREAD_LIMIT=str(self.omp_thread_limit))
+        try:
+            proc = subprocess.run(
+                cmd, input=png.getvalue(), capture_output=True, env=env, timeout=self.timeout or None
+            )
+        except subprocess.TimeoutExpired:
+            # subprocess.run has already killed the process
+            raise RuntimeError("Tesseract process timeout")
+        except OSError as e:
+            if e.errno != errno.ENOENT:
+                raise
+            raise pytesseract.TesseractNotFoundError()
+        if proc.returncode:
+            raise pytesseract.TesseractError(proc.returncode, pytesseract.pytesseract.get_errors(proc.stderr))
+        return proc.stdout.decode("utf-8")
 
     def extract_text(self, image: Union[str, np.ndarray, bytes, Image.Image]) -> Dict[str, Any]:
         """
@@ -46,47 +235,73 @@ class TesseractEngine:
             if isinstance(image, bytes):
                 img_obj = Image.open(io.BytesIO(image))
             elif isinstance(image, np.ndarray):
+                # Tesseract works on 8-bit images; single-channel arrays become mode "L"
+                if image.dtype != np.uint8:
+                    image = np.clip(image, 0, 255).astype(np.uint8)
                 img_obj = Image.fromarray(image)
             elif isinstance(image, str):
                 img_obj = Image.open(image)
             else:
                 img_obj = image
 
-            # 1. Extract Full Text
-            full_text = pytesseract.image_to_string(img_obj, lang=self.languages)
-
-            # 2. Extract Data with Confidence and Bounding Boxes
-            # pytesseract.image_to_data returns a dict with lists of values
-            data = pytesseract.image_to_data(img_obj, lang=self.languages, output_type=pytesseract.Output.DICT)
+            # Extract words with confidence and bounding boxes in a single Tesseract run.
+            # The data is a dict with lists of values; the full text is rebuilt from it
+            # rather than running a separate image-to-string pass.
+            data = self._image_to_data(img_obj)
             
             extracted_data = []
-            num_boxes = len(data['text'])
-            
-            for i in range(num_boxes):
+            lines = []
+            current_words = []
+            current_key = None
+
+            # Cast the numeric columns in one pass each instead of per word. Tesseract marks
+            # non-word rows with conf -1; that test and the 0-100 -> 0-1 rescale are vectorized too.
+            confs = np.asarray(data['conf'], dtype=np.float64)
+            has_conf = (confs > -1).tolist()
+            confs = (confs / 100.0).tolist()
+            boxes = np.asarray(
+                [data['left'], data['top'], data['width'], data['height']], dtype=np.int32
+            ).T.tolist()
+            line_keys = zip(data['block_num'], data['par_num'], data['line_num'])
+
+            for word, conf, scored, (x, y, w, h), key in zip(data['text'], confs, has_conf, boxes, line_keys):
                 # Filter out empty text (often just structure/noise)
-                if int(data['conf'][i]) > -1 and data['text'][i].strip():
+                if not word.strip():
+                    continue
+
+                # Rows arrive in reading order, so a new (block, par, line) key starts a new line.
+                # Paragraph/block changes get a blank line, as image_to_string does.
+                if key != current_key:
+                    if current_words:
+                        lines.append(" ".join(current_words))
+                        if current_key[:2] != key[:2]:
+                            lines.append("")
+                    current_words = []
+                    current_key = key
+                current_words.append(word)
+
+                if scored:
                     item = {
-                        "text": data['text'][i],
+                        "text": word,
                         # Tesseract returns x, y, w, h. We convert to [[x,y], [x+w, y], [x+w, y+h], [x, y+h]] 
                         # to match the previous format if possible, or just keep simpler [x, y, w, h]
                         # Let's use [x, y, w, h] for standard tesseract usage usually, 
                         # but to maintain compatibility with our frontend which might expect points:
                         # documind-ai frontend (app.py) doesn't explicitly draw boxes yet, 
                         # but let's standardize on a simple box format.
-                        "bbox": {
-                            "x": data['left'][i], 
-                            "y": data['top'][i], 
-                            "w": data['width'][i], 
-                            "h": data['height'][i]
-                        },
-                        "confidence": float(data['conf'][i]) / 100.0 # Tesseract is 0-100
+                        "bbox": {"x": x, "y": y, "w": w, "h": h},
+                        "confidence": conf # Tesseract is 0-100, rescaled above
                     }
                     extracted_data.append(item)
 
+            if current_words:
+                lines.append(" ".join(current_words))
+            full_text = "\n".join(lines)
+
             end_time = time.time()
             duration = end_time - start_time
             
-            logger.info(f"OCR completed in {duration:.2f} seconds. Extracted {len(extracted_data)} words.")
+            logger.info("OCR completed in %.2f seconds. Extracted %d words.", duration, len(extracted_data))
 
             return {
                 "text": full_text.strip(),
@@ -101,5 +316,5 @@ class TesseractEngine:
             logger.error("Tesseract binary not found. Please install tesseract-ocr.")
             raise
         except Exception as e:
-            logger.error(f"Error during Tesseract extraction: {str(e)}")
+            logger.error("Error during Tesseract extraction: %s", e)
             raise e
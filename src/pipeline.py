@@ -1,42 +1,116 @@
+import importlib
 import logging
-import time
-from typing import Dict, Any, Union, List
+import os
+import queue
+import re
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter_ns as _now
+from typing import Dict, Any, Union, List, Iterable, Optional
 import numpy as np
 
 from src.preprocessing.image_processor import ImageProcessor
 from src.ocr.tesseract_engine import TesseractEngine
 from src.classification.rule_based import RuleBasedClassifier
 from src.extraction.regex_extractor import RegexExtractor
-from src.extraction.document_specific.invoice_extractor import InvoiceExtractor
-from src.extraction.document_specific.receipt_extractor import ReceiptExtractor
-from src.extraction.document_specific.resume_extractor import ResumeExtractor
 from src.validation.validators import CrossFieldValidator
 from src.validation.auto_correct import AutoCorrector
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Document-specific extractors by document type as (module, class).
+# They are imported and instantiated on first use of that type.
+_EXTRACTOR_CLASSES = {
+    'invoice': ('src.extraction.document_specific.invoice_extractor', 'InvoiceExtractor'),
+    'receipt': ('src.extraction.document_specific.receipt_extractor', 'ReceiptExtractor'),
+    'resume': ('src.extraction.document_specific.resume_extractor', 'ResumeExtractor'),
+}
+
+# Field-name patterns deciding which correction applies to a field (matched on the lowercased key)
+_DATE_KEY_RE = re.compile(r'date')
+_AMOUNT_KEY_RE = re.compile(r'amount|total|price|cost|tax')
+_PHONE_KEY_RE = re.compile(r'phone')
+
+# Fields inside result sections that are auto-corrected, by document type, as
+# (section, field). Other nested fields (line items, party contact details) are kept as extracted.
+_NESTED_CORRECTED_FIELDS = {
+    'invoice': (
+        ('header', 'invoice_date'), ('header', 'due_date'),
+        ('totals', 'subtotal'), ('totals', 'tax'), ('totals', 'shipping'),
+        ('totals', 'discount'), ('totals', 'total_amount'),
+    ),
+    'receipt': (('transaction', 'date'),),
+}
+
+_NS_PER_SECOND = 1e9
+
+# Longest a tesseract process may run on one image before it is killed (pytesseract backend)
+_OCR_TIMEOUT_SECONDS = 120
+
+# Preprocessed pages allowed to wait for a free OCR worker
+_PAGE_QUEUE_SIZE = 2
+
+
+def _correct_field(key: str, field: Dict[str, Any]) -> None:
+    """
+    Auto-correct one extracted field in place, choosing the correction by its key name.
+    The original value is kept under "original_value" when it changes.
+    """
+    val = field["value"]
+    new_val = None
+
+    # Approximate the field type by key name
+    lowered_key = key.lower()
+    if _DATE_KEY_RE.search(lowered_key):
+        new_val = AutoCorrector.correct_date_format(str(val))
+    elif _AMOUNT_KEY_RE.search(lowered_key):
+        new_val = AutoCorrector.correct_amount_format(str(val))
+    elif _PHONE_KEY_RE.search(lowered_key):
+        corrected = AutoCorrector.correct_phone_format(str(val))
+        if corrected: new_val = corrected
+
+    if new_val is not None and new_val != val:
+        field["original_value"] = val
+        field["value"] = new_val
+        field["corrected"] = True
+        logger.debug("Auto-corrected %s: %s -> %s", key, val, new_val)
+
+
+def _to_seconds(timings_ns: Dict[str, int]) -> Dict[str, float]:
+    """Convert a dict of nanosecond stage durations to seconds."""
+    return {stage: duration / _NS_PER_SECOND for stage, duration in timings_ns.items()}
+
+
 class DocumentProcessor:
     """
     Orchestrates the document processing pipeline:
     Preprocessing -> OCR -> Classification -> Extraction -> Validation/Correction
     """
 
-    def __init__(self):
+    def __init__(self, ocr_workers: Optional[int] = None):
         """
         Initialize all pipeline components.
+
+        Args:
+            ocr_workers: Number of pages OCR'd in parallel for multi-page documents.
+                Defaults to the number of CPU cores.
         """
         logger.info("Initializing DocumentPipeline components...")
+        self.ocr_workers = ocr_workers or os.cpu_count() or 1
+
         self.image_processor = ImageProcessor()
-        self.ocr_engine = TesseractEngine()
+        # With pytesseract, single images may use all of Tesseract's OpenMP threads
+        self.ocr_engine = TesseractEngine(timeout=_OCR_TIMEOUT_SECONDS)
+        # Pages are OCR'd by ocr_workers threads at once, one tesserocr API each. Each
+        # tesseract process gets a single OpenMP thread so they do not compete for cores.
+        # tesserocr's limit is process-wide and read at import (see src.ocr.openmp).
+        self.page_ocr_engine = TesseractEngine(
+            pool_size=self.ocr_workers, omp_thread_limit=1, timeout=_OCR_TIMEOUT_SECONDS
+        )
         self.classifier = RuleBasedClassifier()
         
         # Extractors
         self.regex_extractor = RegexExtractor()
-        self.invoice_extractor = InvoiceExtractor()
-        self.receipt_extractor = ReceiptExtractor()
-        self.resume_extractor = ResumeExtractor()
+        self._extractors: Dict[str, Any] = {}
         
         logger.info("DocumentPipeline initialized successfully.")
 
@@ -50,51 +124,54 @@ class DocumentProcessor:
         Returns:
             Dict containing results from all stages and performance metrics.
         """
-        pipeline_start = time.time()
-        timings = {}
+        pipeline_start = _now()
+        # Stage durations are kept in integer nanoseconds and converted to seconds once
+        timings_ns = {}
+        # Checked once so the per-stage progress logs cost nothing when INFO is off
+        log_info = logger.isEnabledFor(logging.INFO)
         
         try:
             # 1. Load & Preprocess
-            start = time.time()
-            logger.info("Stage 1: Preprocessing...")
+            start = _now()
+            if log_info:
+                logger.info("Stage 1: Preprocessing...")
             
             if isinstance(file_path_or_bytes, str) and file_path_or_bytes.lower().endswith('.pdf'):
-                # Simple handling: convert and take first page for MVP
-                images = self.image_processor.convert_pdf_to_images(file_path_or_bytes)
-                original_image = images[0]
+                # Pages are rasterized lazily and streamed through preprocessing and OCR
+                pages = self.image_processor.iter_pdf_pages(file_path_or_bytes)
+                if log_info:
+                    logger.info("Stage 2: OCR (all pages)...")
+                ocr_result = self._ocr_pages(pages, timings_ns)
             else:
-                original_image = self.image_processor.load_image(file_path_or_bytes)
+                original_image = self.image_processor.load_image(file_path_or_bytes, grayscale=True)
+                processed_image = self._preprocess_image(original_image)
+                timings_ns['preprocessing'] = _now() - start
 
-            # Resize for optimal OCR then Enhance
-            resized_image = self.image_processor.resize_for_ocr(original_image)
-            processed_image = self.image_processor.enhance_image(resized_image)
-            
-            timings['preprocessing'] = time.time() - start
+                # 2. OCR
+                start = _now()
+                if log_info:
+                    logger.info("Stage 2: OCR...")
+                ocr_result = self.ocr_engine.extract_text(processed_image)
+                timings_ns['ocr'] = _now() - start
 
-            # 2. OCR
-            start = time.time()
-            logger.info("Stage 2: OCR...")
-            ocr_result = self.ocr_engine.extract_text(processed_image)
             full_text = ocr_result['text']
-            timings['ocr'] = time.time() - start
 
             # 3. Classification
-            start = time.time()
-            logger.info("Stage 3: Classification...")
+            start = _now()
+            if log_info:
+                logger.info("Stage 3: Classification...")
             classification_result = self.classifier.classify(full_text)
             doc_type = classification_result['document_type']
-            timings['classification'] = time.time() - start
+            timings_ns['classification'] = _now() - start
 
             # 4. Extraction
-            start = time.time()
-            logger.info(f"Stage 4: Extraction (Type: {doc_type})...")
+            start = _now()
+            if log_info:
+                logger.info("Stage 4: Extraction (Type: %s)...", doc_type)
             
-            if doc_type == 'invoice':
-                extraction_results = self.invoice_extractor.extract(full_text)
-            elif doc_type == 'receipt':
-                extraction_results = self.receipt_extractor.extract(full_text)
-            elif doc_type == 'resume':
-                extraction_results = self.resume_extractor.extract(full_text)
+            extractor = self._get_extractor(doc_type)
+            if extractor is not None:
+                extraction_results = extractor.extract(full_text)
             else:
                 # Fallback to generic regex extraction
                 if hasattr(self.regex_extractor, 'extract_all'):
@@ -108,11 +185,12 @@ class DocumentProcessor:
                         "urls": self.regex_extractor.extract_urls(full_text)
                     }
                     
-            timings['extraction'] = time.time() - start
+            timings_ns['extraction'] = _now() - start
             
             # 5. Validation & Auto-Correction
-            start = time.time()
-            logger.info("Stage 5: Validation & Correction...")
+            start = _now()
+            if log_info:
+                logger.info("Stage 5: Validation & Correction...")
             
             # Apply corrections to known field types
             self._apply_corrections(extraction_results, doc_type)
@@ -120,69 +198,150 @@ class DocumentProcessor:
             # Validate
             validation_report = CrossFieldValidator.validate(extraction_results, doc_type)
             
-            timings['validation'] = time.time() - start
+            timings_ns['validation'] = _now() - start
 
-            total_duration = time.time() - pipeline_start
+            total_duration = (_now() - pipeline_start) / _NS_PER_SECOND
             
-            logger.info(f"Pipeline completed in {total_duration:.2f} seconds.")
+            if log_info:
+                logger.info("Pipeline completed in %.2f seconds.", total_duration)
 
             return {
                 "status": "success",
                 "document_type": doc_type,
                 "confidence": classification_result['confidence'],
                 "extracted_fields": extraction_results,
-                "validation_report": validation_report,
+                "validation_report": validation_report.to_dict(),
                 "text_content": full_text,
                 "ocr_details": ocr_result['details'],
                 "classification_details": classification_result,
                 "performance": {
                     "total_time": total_duration,
-                    "breakdown": timings
+                    "breakdown": _to_seconds(timings_ns)
                 }
             }
 
         except Exception as e:
-            logger.error(f"Pipeline failed: {str(e)}", exc_info=True)
+            logger.error("Pipeline failed: %s", e, exc_info=True)
             return {
                 "status": "error",
                 "error": str(e),
                 "performance": {
-                    "total_time": time.time() - pipeline_start,
-                    "breakdown": timings
+                    "total_time": (_now() - pipeline_start) / _NS_PER_SECOND,
+                    "breakdown": _to_seconds(timings_ns)
                 }
             }
 
+    def _get_extractor(self, doc_type: str) -> Optional[Any]:
+        """
+        Return the document-specific extractor for doc_type, creating it on first use.
+
+        Args:
+            doc_type: Document type reported by the classifier.
+
+        Returns:
+            The extractor instance, or None if the type has no dedicated extractor.
+        """
+        extractor = self._extractors.get(doc_type)
+        if extractor is None:
+            spec = _EXTRACTOR_CLASSES.get(doc_type)
+            if spec is None:
+                return None
+            module_name, class_name = spec
+            extractor_cls = getattr(importlib.import_module(module_name), class_name)
+            extractor = self._extractors.setdefault(doc_type, extractor_cls())
+        return extractor
+
+    def _preprocess_image(self, image: np.ndarray) -> np.ndarray:
+        """
+        Resize an image for optimal OCR, then enhance it.
+        """
+        resized_image = self.image_processor.resize_for_ocr(image)
+        return self.image_processor.enhance_image(resized_image)
+
+    def _ocr_pages(self, images: Iterable[np.ndarray], timings_ns: Dict[str, int]) -> Dict[str, Any]:
+        """
+        Preprocess and OCR every page of a (possibly multi-page) document.
+
+        The calling thread pulls pages from the iterable and preprocesses them into a
+        bounded queue, from which ocr_workers threads take pages to OCR, so the stages
+        overlap (OpenCV and Tesseract both release the GIL). The queue bound keeps at
+        most a few preprocessed pages in memory ahead of OCR. Page results are merged
+        in page order.
+        """
+        page_queue = queue.Queue(maxsize=_PAGE_QUEUE_SIZE)
+        results_by_page: Dict[int, Dict[str, Any]] = {}
+        errors: List[Exception] = []
+
+        def ocr_worker() -> int:
+            ocr_ns = 0
+            while True:
+                item = page_queue.get()
+                if item is None:
+                    return ocr_ns
+                if errors:
+                    # Keep draining so the producer never blocks on a failed run
+                    continue
+                page_num, image = item
+                start = _now()
+                try:
+                    results_by_page[page_num] = self.page_ocr_engine.extract_text(image)
+                except Exception as e:
+                    errors.append(e)
+                ocr_ns += _now() - start
+
+        timings_ns['preprocessing'] = 0
+        page_count = 0
+        with ThreadPoolExecutor(max_workers=self.ocr_workers) as pool:
+            workers = [pool.submit(ocr_worker) for _ in range(self.ocr_workers)]
+            try:
+                for page_count, image in enumerate(images, start=1):
+                    if errors:
+                        break
+                    start = _now()
+                    processed_image = self._preprocess_image(image)
+                    timings_ns['preprocessing'] += _now() - start
+                    page_queue.put((page_count, processed_image))
+            finally:
+                # One end-of-input marker per worker
+                for _ in workers:
+                    page_queue.put(None)
+            timings_ns['ocr'] = sum(worker.result() for worker in workers)
+
+        if errors:
+            raise errors[0]
+
+        page_results = [results_by_page[page_num] for page_num in range(1, page_count + 1)]
+
+        details = []
+        for page_num, result in enumerate(page_results, start=1):
+            for item in result['details']:
+                details.append({**item, "page": page_num})
+
+        return {
+            "text": "\n\n".join(result['text'] for result in page_results),
+            "details": details
+        }
+
     def _apply_corrections(self, data: Dict[str, Any], doc_type: str):
         """
         Iterate through extracted fields and try to auto-correct standard formats.
         Modifies data in-place.
         """
-        # Define fields to check based on typical extractor outputs
-        # This is a bit manual, but we can look for "value" keys and corresponding field info
-        
-        # Generic recursive search or key-based?
-        # Extractors usually return flat dicts or nested dicts where leaf nodes are Field objects
-        
+        # Top-level fields are corrected by key name; inside sections only the
+        # fields listed for the document type are, so everything else is left as extracted
+        nested_fields = _NESTED_CORRECTED_FIELDS.get(doc_type, ())
+
+        # Nothing to correct (e.g. flat string results from the regex fallback): skip the walk
+        if not nested_fields and not any(isinstance(v, dict) and "value" in v for v in data.values()):
+            return
+
         for key, field in data.items():
             if isinstance(field, dict) and "value" in field:
-                val = field["value"]
-                
-                # Correction logic
-                new_val = None
-                
-                # Check key naming convention or field type if we had it
-                # For now, approximate by key name
-                if "date" in key.lower():
-                    new_val = AutoCorrector.correct_date_format(str(val))
-                elif "amount" in key.lower() or "total" in key.lower() or "price" in key.lower() or "cost" in key.lower() or "tax" in key.lower():
-                    new_val = AutoCorrector.correct_amount_format(str(val))
-                elif "phone" in key.lower():
-                     corrected = AutoCorrector.correct_phone_format(str(val))
-                     if corrected: new_val = corrected
-
-                if new_val is not None and new_val != val:
-                    field["original_value"] = val
-                    field["value"] = new_val
-                    field["corrected"] = True
-                    logger.debug(f"Auto-corrected {key}: {val} -> {new_val}")
+                _correct_field(key, field)
 
+        for section, key in nested_fields:
+            node = data.get(section)
+            if isinstance(node, dict):
+                field = node.get(key)
+                if isinstance(field, dict) and "value" in field:
+                    _correct_field(key, field)
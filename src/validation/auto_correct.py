@@ -1,132 +1,172 @@
 import re
+import datetime
 import logging
+from functools import lru_cache
 from typing import Optional, List, Any
 import dateutil.parser
 import phonenumbers
 
 logger = logging.getLogger(__name__)
 
-class AutoCorrector:
+# Built once at import; these run for every extracted amount/date field
+_AMOUNT_JUNK = re.compile(r"[^\d.,-]")
+_DT_PARSER = dateutil.parser.parser()
+
+# Characters OCR commonly produces in place of digits
+_OCR_REPLACEMENTS = {'O': '0', 'o': '0', 'S': '5', 's': '5', 'B': '8', 'l': '1', 'I': '1', 'Z': '2'}
+_CONFUSION_CHARS = frozenset(_OCR_REPLACEMENTS)
+_OCR_TRANS = str.maketrans(_OCR_REPLACEMENTS)
+
+# phonenumbers loads region metadata lazily; load the default region's at import
+# instead of on the first document's first phone field
+phonenumbers.PhoneMetadata.metadata_for_region("US")
+
+# Pure functions over the raw field text; the same dates, amounts and phone numbers
+# recur across documents, so results are memoized. lru_cache needs hashable arguments,
+# so the public wrappers below only use the cache for strings.
+@lru_cache(maxsize=4096)
+def _normalize_date(date_str: str, today: datetime.date) -> Optional[str]:
     """
-    Normalizes extracted data and correct common OCR errors.
+    Normalize a date string to ISO 8601 (YYYY-MM-DD).
+    Parts missing from it (e.g. the year of "Jan 5") are taken from today, which is an
+    argument so cached results do not outlive the day they were computed on.
     """
+    try:
+        # Fuzzy parsing allows strings like "Due: Jan 5, 2023" to be parsed
+        default = datetime.datetime.combine(today, datetime.time())
+        dt = _DT_PARSER.parse(date_str, default=default, fuzzy=True)
+        return dt.strftime("%Y-%m-%d")
+    except (ValueError, TypeError):
+        logger.debug("Could not parse date: %s", date_str)
+        return None
 
-    @staticmethod
-    def correct_date_format(date_str: str) -> Optional[str]:
-        """
-        Normalize various date formats to ISO 8601 (YYYY-MM-DD).
-        """
-        if not date_str:
-            return None
-        try:
-            # Fuzzy parsing allows strings like "Due: Jan 5, 2023" to be parsed
-            dt = dateutil.parser.parse(date_str, fuzzy=True)
-            return dt.strftime("%Y-%m-%d")
-        except (ValueError, TypeError):
-            logger.debug(f"Could not parse date: {date_str}")
-            return None
+def _correct_date_format(date_str: Any) -> Optional[str]:
+    """
+    Normalize various date formats to ISO 8601 (YYYY-MM-DD).
+    """
+    if not date_str:
+        return None
+    if isinstance(date_str, str):
+        return _normalize_date(date_str, datetime.date.today())
+    return _normalize_date.__wrapped__(date_str, datetime.date.today())
 
-    @staticmethod
-    def correct_amount_format(amount_str: str) -> Optional[float]:
-        """
-        Normalize currency amounts.
-        """
-        if not amount_str:
-            return None
-            
-    @staticmethod
-    def correct_amount_format(amount_str: str) -> Optional[float]:
-        """
-        Normalize currency amounts.
-        """
-        if not amount_str:
-            return None
-            
-        str_val = str(amount_str)
-        
-        # 0. Heuristic: Remove words that look like text/currency codes first.
-        # We consider a word "text" if it contains letters that are NOT in our replacement list.
-        # Confusion list: O, o, S, s, B, l, I, Z
-        confusion_chars = set(['O', 'o', 'S', 's', 'B', 'l', 'I', 'Z'])
-        
-        # Split by whitespace to handle "USD 50.00"
-        parts = str_val.split()
-        valid_parts = []
-        
-        for part in parts:
-            # Check if part contains any alpha char NOT in confusion_chars
-            # If so, we assume it's a label/code (e.g. "USD", "Total") and discard it.
-            # We use checks on standard ASCII letters A-Za-z.
-            is_text_word = False
-            for char in part:
-                 if char.isalpha() and char not in confusion_chars:
-                     is_text_word = True
-                     break
-            
-            if not is_text_word:
-                valid_parts.append(part)
-        
-        # If we filtered everything away (e.g. "Free"), return None
-        if not valid_parts:
-            # Fallback: maybe it was compact like "GBP100"?
-            # If strict filtering killed it, try the original string but strict regex?
-            # For now, let's respect the filtering.
-             return None
-             
-        str_val = " ".join(valid_parts)
-        
-        # 1. OCR Character Replacements (Targeted)
-        replacements = {'O': '0', 'o': '0', 'S': '5', 's': '5', 'B': '8', 'l': '1', 'I': '1', 'Z': '2'}
-        for char, rep in replacements.items():
-            str_val = str_val.replace(char, rep)
-
-        # 2. Clean up known non-numeric junk
-        # Remove currency symbols and valid text
-        # Keep digits, dots, commas, minus sign
-        cleaned = re.sub(r"[^\d.,-]", "", str_val)
-        
-        # 3. Handle decimal/thousand separators logic
-        try:
-            # If comma is decimal separator (10,00) vs thousands separator (10,000.00) makes it tricky
-            # Heuristic: if '.' in string, assume dot is decimal unless multiple dots.
-            # If ',' in string and '.' not in string, look at position.
-            
-            # Simple US/UK Centric: Remove ',' entirely, keep '.'
-            # (TODO: Add locale support for EU style 1.000,00)
-            
-            # Robust check for comma usage
-            if ',' in cleaned and '.' in cleaned:
+@lru_cache(maxsize=4096)
+def _normalize_amount(str_val: str) -> Optional[float]:
+    """
+    Normalize a currency amount string.
+    """
+    # 0. Heuristic: Remove words that look like text/currency codes first.
+    # We consider a word "text" if it contains letters that are NOT in our replacement list.
+    # Confusion list: O, o, S, s, B, l, I, Z
+
+    # Split by whitespace to handle "USD 50.00"
+    parts = str_val.split()
+    valid_parts = []
+
+    for part in parts:
+        # Check if part contains any alpha char NOT in confusion_chars
+        # If so, we assume it's a label/code (e.g. "USD", "Total") and discard it.
+        # We use checks on standard ASCII letters A-Za-z.
+        is_text_word = False
+        for char in part:
+             if char.isalpha() and char not in _CONFUSION_CHARS:
+                 is_text_word = True
+                 break
+
+        if not is_text_word:
+            valid_parts.append(part)
+
+    # If we filtered everything away (e.g. "Free"), return None
+    if not valid_parts:
+        # Fallback: maybe it was compact like "GBP100"?
+        # If strict filtering killed it, try the original string but strict regex?
+        # For now, let's respect the filtering.
+         return None
+
+    str_val = " ".join(valid_parts)
+
+    # 1. OCR Character Replacements (Targeted)
+    str_val = str_val.translate(_OCR_TRANS)
+
+    # 2. Clean up known non-numeric junk
+    # Remove currency symbols and valid text
+    # Keep digits, dots, commas, minus sign
+    cleaned = _AMOUNT_JUNK.sub("", str_val)
+
+    # 3. Handle decimal/thousand separators logic
+    try:
+        # If comma is decimal separator (10,00) vs thousands separator (10,000.00) makes it tricky
+        # Heuristic: if '.' in string, assume dot is decimal unless multiple dots.
+        # If ',' in string and '.' not in string, look at position.
+
+        # Simple US/UK Centric: Remove ',' entirely, keep '.'
+        # (TODO: Add locale support for EU style 1.000,00)
+
+        # Robust check for comma usage.
+        # Each separator is located once; the branches below only compare positions.
+        last_comma = cleaned.rfind(',')
+        if last_comma != -1:
+            last_dot = cleaned.rfind('.')
+            if last_dot != -1:
                 # 1,234.56 -> 1234.56
-                if cleaned.rfind(',') < cleaned.rfind('.'):
+                if last_comma < last_dot:
                     cleaned = cleaned.replace(',', '')
                 else: 
                     # 1.234,56 -> 1234.56
                     cleaned = cleaned.replace('.', '').replace(',', '.')
-            elif ',' in cleaned:
-                # 100,50 -> 100.50 (if looking like decimal) or 100,000 -> 100000
-                if len(cleaned.split(',')[-1]) == 2:
-                     cleaned = cleaned.replace(',', '.')
-                else:
-                     cleaned = cleaned.replace(',', '')
-                     
-            return float(cleaned)
-        except ValueError:
-            return None
+            # 100,50 -> 100.50 (if looking like decimal) or 100,000 -> 100000
+            elif len(cleaned) - last_comma == 3:
+                 cleaned = cleaned.replace(',', '.')
+            else:
+                 cleaned = cleaned.replace(',', '')
 
-    @staticmethod
-    def correct_phone_format(phone_str: str, region: str = "US") -> Optional[str]:
-        """
-        Normalize phone number to E.164.
-        """
-        if not phone_str:
-            return None
-        try:
-            parsed = phonenumbers.parse(phone_str, region)
-            if phonenumbers.is_valid_number(parsed):
-                return phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
-            return None
-        except phonenumbers.NumberParseException:
+        return float(cleaned)
+    except ValueError:
+        return None
+
+@lru_cache(maxsize=4096)
+def _normalize_phone(phone_str: str, region: str) -> Optional[str]:
+    """
+    Normalize a phone number string to E.164.
+    """
+    try:
+        parsed = phonenumbers.parse(phone_str, region, keep_raw_input=False)
+        # The length check is much cheaper than full validation and rejects most OCR noise
+        if not phonenumbers.is_possible_number(parsed):
             return None
+        if phonenumbers.is_valid_number(parsed):
+            return phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
+        return None
+    except phonenumbers.NumberParseException:
+        return None
+
+def _correct_amount_format(amount_str: Any) -> Optional[float]:
+    """
+    Normalize currency amounts.
+    """
+    if not amount_str:
+        return None
+    return _normalize_amount(str(amount_str))
+
+def _correct_phone_format(phone_str: Any, region: str = "US") -> Optional[str]:
+    """
+    Normalize phone number to E.164.
+    """
+    if not phone_str:
+        return None
+    if isinstance(phone_str, str):
+        return _normalize_phone(phone_str, region)
+    return _normalize_phone.__wrapped__(phone_str, region)
+
+
+class AutoCorrector:
+    """
+    Normalizes extracted data and correct common OCR errors.
+    """
+
+    correct_date_format = staticmethod(_correct_date_format)
+    correct_amount_format = staticmethod(_correct_amount_format)
+    correct_phone_format = staticmethod(_correct_phone_format)
 
     @staticmethod
     def suggest_corrections(value: str, field_type: str, confidence: float) -> List[Any]:
@@ -139,10 +179,7 @@ class AutoCorrector:
         if field_type == "amount" or field_type == "currency":
             # Check for common OCR confusions: S -> 5, O -> 0, B -> 8
             # Only apply if value is mixed alphanumeric but expected numeric
-            replacements = {'O': '0', 'o': '0', 'S': '5', 's': '5', 'B': '8', 'l': '1', 'I': '1', 'Z': '2'}
-            new_val = value
-            for char, rep in replacements.items():
-                new_val = new_val.replace(char, rep)
+            new_val = value.translate(_OCR_TRANS)
                 
             corrected = AutoCorrector.correct_amount_format(new_val)
             if corrected is not None and str(corrected) != value:
@@ -1,11 +1,144 @@
 import re
+import math
 import datetime
+from dataclasses import dataclass, field
+from decimal import Decimal
+from functools import lru_cache
+import numpy as np
 import phonenumbers
 from typing import Dict, Any, List, Optional
 import logging
 
+try:
+    import re2
+except ImportError:
+    # Optional: google-re2 matches in linear time; the standard re module is the fallback
+    re2 = None
+
 logger = logging.getLogger(__name__)
 
+# Compiled once. The anchor must not accept a trailing newline: RE2's $ already
+# means end of text, while re needs \Z.
+_EMAIL_PATTERN = r"^[a-zA-Z0-9_.+\-]+@[a-zA-Z0-9\-]+\.[a-zA-Z0-9\-.]+"
+if re2 is not None:
+    _EMAIL_RE = re2.compile(_EMAIL_PATTERN + "$")
+else:
+    _EMAIL_RE = re.compile(_EMAIL_PATTERN + r"\Z")
+_BLACKLIST_DOMAINS = frozenset(("example.com", "test.com"))
+
+# Currency symbol and thousands separators removed before parsing an amount string
+_CURRENCY_STRIP = str.maketrans("", "", "$,")
+
+def _clean_amount_str(val: Any) -> Any:
+    """Strip '$' and ',' from string amounts in one pass; other values are returned as-is."""
+    if isinstance(val, str):
+        return val.translate(_CURRENCY_STRIP)
+    return val
+
+# Amount fields checked by CrossFieldValidator, in report order
+_AMOUNT_KEYS = ("subtotal", "tax", "total_amount", "discount")
+
+# Key groups CrossFieldValidator dispatches on; the totals and dates checks
+# can only fail when every key of their group is present
+_AMOUNT_KEY_SET = frozenset(_AMOUNT_KEYS)
+_TOTALS_KEYS = frozenset(("subtotal", "total_amount"))
+_DATE_KEYS = frozenset(("invoice_date", "due_date"))
+_VALIDATED_KEYS = _AMOUNT_KEY_SET | _DATE_KEYS | {"contact_info"}
+
+# Accepted (min, max) year for document dates, fixed at import instead of calling now() per date
+_YEAR_BOUNDS = (1900, datetime.date.today().year + 10)
+
+@lru_cache(maxsize=2048)
+def _fromisoformat(date_str: str) -> Optional[datetime.date]:
+    """date.fromisoformat, returning None instead of raising; memoized."""
+    try:
+        return datetime.date.fromisoformat(date_str)
+    except ValueError:
+        return None
+
+def _parse_iso_date(date_str: str) -> Optional[datetime.date]:
+    """Parse a YYYY-MM-DD string, returning None if it is not one."""
+    # fromisoformat is a C fast path, but from Python 3.11 it also takes other ISO 8601
+    # forms (20230101, 2023-W01-1), so the shape is checked first. Checking it outside
+    # the cache also keeps garbled OCR strings from evicting real dates.
+    if not isinstance(date_str, str) or len(date_str) != 10 or date_str[4] != '-' or date_str[7] != '-':
+        return None
+    return _fromisoformat(date_str)
+
+def _valid_iso_date(date_str: str) -> Optional[datetime.date]:
+    """Return the parsed date if it is a YYYY-MM-DD date in the accepted year range."""
+    if not date_str:
+        return None
+    dt = _parse_iso_date(date_str)
+    if dt is not None and _YEAR_BOUNDS[0] <= dt.year <= _YEAR_BOUNDS[1]:
+        return dt
+    return None
+
+# Formatting characters removed before the NANP structure check
+_PHONE_FORMATTING = str.maketrans("", "", "()-. ")
+
+def _impossible_nanp_number(phone: str) -> bool:
+    """
+    Cheap structural rejection for US numbers: a 10-digit number (optionally with a
+    leading 1) whose area code starts with 0 or 1 can never be valid. Anything else,
+    including short codes and international numbers, is left to phonenumbers.
+    """
+    if phone.startswith('+'):
+        return False
+    digits = phone.translate(_PHONE_FORMATTING)
+    if not digits.isdigit():
+        return False
+    if len(digits) == 11 and digits[0] == '1':
+        digits = digits[1:]
+    return len(digits) == 10 and digits[0] in '01'
+
+# Longer phone strings (extensions, OCR run-ons) rarely recur, so they skip the cache
+_PHONE_CACHE_MAX_LEN = 20
+
+@lru_cache(maxsize=4096)
+def _parse_and_validate_phone(phone: str, region: str) -> bool:
+    """Parse and validate a phone number; memoized since the same numbers recur across documents."""
+    try:
+        parsed = phonenumbers.parse(phone, region)
+        return phonenumbers.is_valid_number(parsed)
+    except phonenumbers.NumberParseException:
+        return False
+
+def _parse_amount(val: Any) -> Optional[float]:
+    """Convert an amount value (number or currency string) to float; None if it is not one."""
+    # Handle simplified field extraction where value might be string with currency symbols
+    val = _clean_amount_str(val)
+    try:
+        return float(val)
+    except (ValueError, TypeError):
+        return None
+
+def _extract_amount_field(data: Dict[str, Any], key: str) -> float:
+    """Return data[key]["value"] as a float, or 0.0 if the field is missing or not numeric."""
+    field = data.get(key)
+    if field and isinstance(field, dict):
+        amount = _parse_amount(field.get("value", 0.0))
+        return amount if amount is not None else 0.0
+    return 0.0
+
+def _to_decimal(amount: float) -> Decimal:
+    """Exact decimal value of an amount as written (str, not the binary float, so 1.1 stays 1.1)."""
+    return Decimal(str(amount))
+
+def _lookup_amount(data: Dict[str, Any], amounts: Optional[Dict[str, float]], key: str) -> float:
+    """Return the amount for key from the already-parsed amounts if present, else from data."""
+    if amounts and key in amounts:
+        return amounts[key]
+    return _extract_amount_field(data, key)
+
+def _extract_date_field(data: Dict[str, Any], key: str) -> Optional[datetime.date]:
+    """Return data[key]["value"] as a date if it passes validate_date, else None."""
+    field = data.get(key)
+    if field and isinstance(field, dict):
+        # Parsed once: the same check validate_date applies, returning the date itself
+        return _valid_iso_date(field.get("value"))
+    return None
+
 class FieldValidator:
     """
     Validates individual field values.
@@ -19,13 +152,12 @@ class FieldValidator:
         if not email:
             return False
         # Basic regex
-        pattern = r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$"
-        if not re.match(pattern, email):
+        if not _EMAIL_RE.match(email):
             return False
         
         # Domain check (blacklist example)
-        domain = email.split('@')[-1]
-        if domain in ["example.com", "test.com"]:
+        domain = email.rpartition('@')[2]
+        if domain in _BLACKLIST_DOMAINS:
             return False
             
         return True
@@ -37,11 +169,11 @@ class FieldValidator:
         """
         if not phone:
             return False
-        try:
-            parsed = phonenumbers.parse(phone, region)
-            return phonenumbers.is_valid_number(parsed)
-        except phonenumbers.NumberParseException:
+        if region == "US" and _impossible_nanp_number(phone):
             return False
+        if len(phone) > _PHONE_CACHE_MAX_LEN:
+            return _parse_and_validate_phone.__wrapped__(phone, region)
+        return _parse_and_validate_phone(phone, region)
 
     @staticmethod
     def validate_date(date_str: str) -> bool:
@@ -50,21 +182,7 @@ class FieldValidator:
         Assumes ISO format YYYY-MM-DD or simple formats if parsed differently.
         Here we assume the extracted value is already normalized to YYYY-MM-DD or is a string we check.
         """
-        if not date_str:
-            return False
-        
-        # Check ISO format
-        try:
-            dt = datetime.datetime.strptime(date_str, "%Y-%m-%d")
-        except ValueError:
-            return False
-            
-        year = dt.year
-        current_year = datetime.datetime.now().year
-        
-        if 1900 <= year <= current_year + 10:
-            return True
-        return False
+        return _valid_iso_date(date_str) is not None
 
     @staticmethod
     def validate_amount(amount: Any) -> bool:
@@ -73,16 +191,20 @@ class FieldValidator:
         """
         if amount is None:
             return False
-        try:
-            val = float(amount)
-            if val < 0:
+        # Corrected amounts are already numbers; only strings need parsing
+        if type(amount) is float or type(amount) is int:
+            val = amount
+        else:
+            try:
+                val = float(amount)
+            except (ValueError, TypeError):
                 return False
-            if val > 1_000_000_000: # 1 Billion cap for sanity
-                logger.warning(f"Amount {val} seems excessively large.")
-                return True # Technically valid but suspicious
-            return True
-        except ValueError:
+        if val < 0:
             return False
+        if val > 1_000_000_000: # 1 Billion cap for sanity
+            logger.warning("Amount %s seems excessively large.", val)
+            return True # Technically valid but suspicious
+        return True
 
 class InvoiceValidator:
     """
@@ -90,44 +212,92 @@ class InvoiceValidator:
     """
     
     @staticmethod
-    def validate_totals(data: Dict[str, Any], tolerance: float = 0.05) -> Dict[str, Any]:
+    def validate_totals(
+        data: Dict[str, Any],
+        tolerance: float = 0.05,
+        amounts: Optional[Dict[str, float]] = None
+    ) -> Dict[str, Any]:
         """
         Check if Subtotal + Tax + Shipping - Discount == Total.
         Returns validation result dict.
+
+        Args:
+            data: Extracted fields.
+            tolerance: Allowed absolute difference between calculated and extracted total.
+            amounts: Amounts already parsed from data by the caller, by field name;
+                fields not in it are read from data.
         """
         validation_results = {"valid": True, "errors": []}
         
-        def get_val(key):
-            field = data.get(key)
-            if field and isinstance(field, dict):
-                # Handle simplified field extraction where value might be string with currency symbols
-                val = field.get("value", 0.0)
-                if isinstance(val, str):
-                    val = val.replace("$", "").replace(",", "")
-                try:
-                    return float(val)
-                except ValueError:
-                    return 0.0
-            return 0.0
-            
-        subtotal = get_val("subtotal")
-        tax = get_val("tax")
-        shipping = get_val("shipping")
-        discount = get_val("discount")
-        total_amount = get_val("total_amount")
+        # Only validate if we have at least subtotal and total; the other
+        # amounts are not read at all for invoices missing either (a NaN fails both tests)
+        subtotal = _lookup_amount(data, amounts, "subtotal")
+        if not subtotal > 0:
+            return validation_results
+        total_amount = _lookup_amount(data, amounts, "total_amount")
+        if not total_amount > 0:
+            return validation_results
+
+        tax = _lookup_amount(data, amounts, "tax")
+        shipping = _lookup_amount(data, amounts, "shipping")
+        discount = _lookup_amount(data, amounts, "discount")
+        # "inf"/"nan" parse as floats but have no Decimal difference to compare;
+        # they never add up, as in validate_totals_batch
+        if not all(map(math.isfinite, (subtotal, tax, shipping, discount, total_amount))):
+            validation_results["valid"] = False
+            validation_results["errors"].append("Total mismatch: non-finite amount")
+            return validation_results
+
+        # Summed in decimal so binary rounding cannot push a difference of exactly
+        # the tolerance over it (e.g. 1.1 + 2.2 vs 3.25)
+        calculated_total = (
+            _to_decimal(subtotal) + _to_decimal(tax) + _to_decimal(shipping) - _to_decimal(discount)
+        )
         
-        # Only validate if we have at least subtotal and total
-        if subtotal > 0 and total_amount > 0:
-            calculated_total = subtotal + tax + shipping - discount
-            
-            if abs(calculated_total - total_amount) > tolerance:
-                validation_results["valid"] = False
-                validation_results["errors"].append(
-                    f"Total mismatch: Calculated {calculated_total:.2f} != Extracted {total_amount:.2f}"
-                )
+        if abs(calculated_total - _to_decimal(total_amount)) > _to_decimal(tolerance):
+            validation_results["valid"] = False
+            validation_results["errors"].append(
+                f"Total mismatch: Calculated {calculated_total:.2f} != Extracted {total_amount:.2f}"
+            )
             
         return validation_results
 
+    @staticmethod
+    def validate_totals_batch(
+        subtotals: np.ndarray,
+        taxes: np.ndarray,
+        shippings: np.ndarray,
+        discounts: np.ndarray,
+        totals: np.ndarray,
+        tolerance: float = 0.05
+    ) -> np.ndarray:
+        """
+        Vectorized validate_totals over many invoices (e.g. when revalidating stored documents).
+
+        Args:
+            subtotals: Subtotal per invoice (0 where missing).
+            taxes: Tax per invoice (0 where missing).
+            shippings: Shipping per invoice (0 where missing).
+            discounts: Discount per invoice (0 where missing).
+            totals: Extracted total per invoice (0 where missing).
+            tolerance: Allowed absolute difference between calculated and extracted total.
+
+        Returns:
+            Boolean array, True where the invoice's totals are consistent. As in
+            validate_totals, invoices without a positive subtotal and total are valid,
+            and checked invoices with a non-finite amount are not.
+        """
+        subtotals = np.asarray(subtotals, dtype=np.float64)
+        totals = np.asarray(totals, dtype=np.float64)
+        calculated = subtotals + np.asarray(taxes, dtype=np.float64) \
+            + np.asarray(shippings, dtype=np.float64) - np.asarray(discounts, dtype=np.float64)
+        checked = (subtotals > 0) & (totals > 0)
+        # rtol=0 keeps the purely absolute tolerance of validate_totals. isclose treats
+        # equal infinities as close, so non-finite sums are rejected explicitly.
+        consistent = np.isfinite(calculated) & np.isfinite(totals) \
+            & np.isclose(calculated, totals, rtol=0.0, atol=tolerance)
+        return ~checked | consistent
+
     @staticmethod
     def validate_dates(data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -135,22 +305,14 @@ class InvoiceValidator:
         """
         validation_results = {"valid": True, "errors": []}
         
-        def get_date(key):
-            field = data.get(key)
-            if field and isinstance(field, dict):
-                val = field.get("value")
-                if FieldValidator.validate_date(val):
-                    return datetime.datetime.strptime(val, "%Y-%m-%d")
-            return None
-            
-        inv_date = get_date("invoice_date")
-        due_date = get_date("due_date")
+        inv_date = _extract_date_field(data, "invoice_date")
+        due_date = _extract_date_field(data, "due_date")
         
         if inv_date and due_date:
             if due_date < inv_date:
                 validation_results["valid"] = False
                 validation_results["errors"].append(
-                    f"Due Date {due_date.date()} is before Invoice Date {inv_date.date()}"
+                    f"Due Date {due_date} is before Invoice Date {inv_date}"
                 )
                 
         return validation_results
@@ -167,56 +329,80 @@ class ResumeValidator:
         # Placeholder
         return {"valid": True, "errors": []}
 
+@dataclass(slots=True)
+class ValidationReport:
+    """
+    Result of CrossFieldValidator.validate.
+    """
+    document_valid: bool = True
+    field_validations: Dict[str, bool] = field(default_factory=dict)
+    logic_validations: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the report as a plain dict (e.g. for JSON responses)."""
+        return {
+            "document_valid": self.document_valid,
+            "field_validations": self.field_validations,
+            "logic_validations": self.logic_validations
+        }
+
 class CrossFieldValidator:
     """
     Runs all appropriate validators for a document type.
     """
     
     @staticmethod
-    def validate(data: Dict[str, Any], document_type: str) -> Dict[str, Any]:
+    def validate(data: Dict[str, Any], document_type: str) -> ValidationReport:
         """
         Main validation entry point.
         """
-        report = {
-            "document_valid": True,
-            "field_validations": {},
-            "logic_validations": []
-        }
+        report = ValidationReport()
+
+        # One pass over the keys decides which of the checks below can apply
+        present = data.keys() & _VALIDATED_KEYS
         
         # 1. Field Validations (Generic)
         # Walk through common keys
         
-        # Invoice/Receipt amounts
-        for key in ["subtotal", "tax", "total_amount", "discount"]:
-            if key in data and isinstance(data[key], dict):
-                val = data[key].get("value")
-                # Clean currency string
-                if isinstance(val, str):
-                    val = val.replace("$", "").replace(",", "")
-                is_valid = FieldValidator.validate_amount(val)
-                report["field_validations"][key] = is_valid
-                if not is_valid: report["document_valid"] = False
+        # Invoice/Receipt amounts. Each is parsed once here and the parsed
+        # values are reused by the totals check below.
+        amounts = {}
+        if not present.isdisjoint(_AMOUNT_KEY_SET):
+            for key in _AMOUNT_KEYS:
+                field = data.get(key)
+                if isinstance(field, dict):
+                    amount = _parse_amount(field.get("value"))
+                    is_valid = amount is not None and FieldValidator.validate_amount(amount)
+                    amounts[key] = amount if amount is not None else 0.0
+                    report.field_validations[key] = is_valid
+                    if not is_valid: report.document_valid = False
 
         # Contact info check
-        if "contact_info" in data and isinstance(data["contact_info"], dict):
-            ci = data["contact_info"]
-            if "email" in ci and isinstance(ci["email"], dict):
-                is_valid = FieldValidator.validate_email(ci["email"].get("value"))
-                report["field_validations"]["email"] = is_valid
-            if "phone" in ci and isinstance(ci["phone"], dict):
-                is_valid = FieldValidator.validate_phone_number(ci["phone"].get("value"))
-                report["field_validations"]["phone"] = is_valid
+        ci = data.get("contact_info") if "contact_info" in present else None
+        if isinstance(ci, dict):
+            email = ci.get("email")
+            if isinstance(email, dict):
+                is_valid = FieldValidator.validate_email(email.get("value"))
+                report.field_validations["email"] = is_valid
+            phone = ci.get("phone")
+            if isinstance(phone, dict):
+                is_valid = FieldValidator.validate_phone_number(phone.get("value"))
+                report.field_validations["phone"] = is_valid
                 
         # 2. Logic Validations
         if document_type == "invoice":
-            totals = InvoiceValidator.validate_totals(data)
-            if not totals["valid"]:
-                report["document_valid"] = False
-                report["logic_validations"].extend(totals["errors"])
-                
-            dates = InvoiceValidator.validate_dates(data)
-            if not dates["valid"]:
-                report["document_valid"] = False
-                report["logic_validations"].extend(dates["errors"])
+            # A missing subtotal or total always passes validate_totals, and a
+            # missing date always passes validate_dates, so those calls are skipped
+            if _TOTALS_KEYS <= present:
+                totals = InvoiceValidator.validate_totals(data, amounts=amounts)
+                if not totals["valid"]:
+                    report.document_valid = False
+                    report.logic_validations.extend(totals["errors"])
+
+            if _DATE_KEYS <= present:
+                dates = InvoiceValidator.validate_dates(data)
+                if not dates["valid"]:
+                    report.document_valid = False
+                    report.logic_validations.extend(dates["errors"])
                 
         return report
@@ -0,0 +1,27 @@
+import pytest
+import numpy as np
+from src.ocr.tesseract_engine import TesseractEngine
+
+
+def pytest_configure(config):
+    # Registered here too so the marker is known when pytest-xdist is not installed
+    config.addinivalue_line(
+        "markers", "xdist_group(name): run the marked tests on the same xdist worker (--dist loadgroup)"
+    )
+
+
+@pytest.fixture(scope="session")
+def dummy_image_100():
+    """Blank 100x100 RGB image shared by the OCR tests; read-only so no test can alter it."""
+    image = np.zeros((100, 100, 3), dtype=np.uint8)
+    image.setflags(write=False)
+    return image
+
+
+@pytest.fixture(scope="session")
+def tess_engine():
+    """Real TesseractEngine shared by the live OCR tests, so the engine and its API are set up once."""
+    try:
+        return TesseractEngine()
+    except Exception as e:
+        pytest.fail(f"Could not initialize TesseractEngine. Is pytesseract installed? Error: {e}")
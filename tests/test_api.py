@@ -59,7 +59,9 @@ def test_process_document_invalid_file():
     # "Unknown file type" is returned when filetype.guess fails to find a magic number match
     assert "Unknown file type" in response.json()["detail"] or "Invalid file type" in response.json()["detail"]
 
-def test_process_document_success():
+def test_process_document_success(tmp_path, monkeypatch):
+    # Uploads are written to a temporary folder instead of the repo's data/raw
+    monkeypatch.setattr("main.UPLOAD_DIR", str(tmp_path))
     # We need a valid dummy PDF or Image. 
     # Create a small valid PDF bytes
     # Minimal PDF header
@@ -1,5 +1,6 @@
+import datetime
 import pytest
-from src.validation.auto_correct import AutoCorrector
+from src.validation.auto_correct import AutoCorrector, _normalize_date
 
 class TestAutoCorrector:
     
@@ -52,3 +53,25 @@ class TestAutoCorrector:
         # Date fix
         sug = AutoCorrector.suggest_corrections("Jan 5, 2023", "date", 0.5)
         assert "2023-01-05" in sug
+
+    def test_corrections_are_memoized(self):
+        _normalize_date.cache_clear()
+        
+        assert AutoCorrector.correct_date_format("Mar 3, 2024") == "2024-03-03"
+        assert AutoCorrector.correct_date_format("Mar 3, 2024") == "2024-03-03"
+        
+        info = _normalize_date.cache_info()
+        assert info.misses == 1
+        assert info.hits == 1
+
+    def test_cached_dates_follow_the_calendar(self):
+        # Missing parts come from today, which is part of the cache key
+        assert _normalize_date("Jan 5", datetime.date(2025, 12, 31)) == "2025-01-05"
+        assert _normalize_date("Jan 5", datetime.date(2026, 1, 1)) == "2026-01-05"
+        assert _normalize_date("15", datetime.date(2026, 2, 1)) == "2026-02-15"
+
+    def test_non_string_inputs_bypass_cache(self):
+        # Unhashable values are not cached but handled as before memoization
+        assert AutoCorrector.correct_amount_format(['1']) == 1.0
+        assert AutoCorrector.correct_amount_format(12.5) == 12.5
+        assert AutoCorrector.correct_date_format(['Jan 5, 2023']) is None
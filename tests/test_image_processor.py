@@ -0,0 +1,40 @@
+import os
+import numpy as np
+from unittest.mock import patch
+from PIL import Image
+from src.preprocessing.image_processor import ImageProcessor
+
+def _fake_convert_from_path(pdf_path, output_folder, first_page, last_page, **kwargs):
+    # Stands in for poppler: writes one small page image per requested page
+    paths = []
+    for page in range(first_page, last_page + 1):
+        path = os.path.join(output_folder, "page-%d.png" % page)
+        Image.new('L', (4, 4), color=page).save(path)
+        paths.append(path)
+    return paths
+
+class TestPdfConversion:
+
+    @patch('src.preprocessing.image_processor.convert_from_path', side_effect=_fake_convert_from_path)
+    @patch('src.preprocessing.image_processor.pdfinfo_from_path', return_value={"Pages": 10})
+    def test_iter_pdf_pages_renders_in_batches(self, mock_info, mock_convert):
+        pages = list(ImageProcessor.iter_pdf_pages(b"%PDF-1.4 fake"))
+
+        assert [int(page[0, 0]) for page in pages] == list(range(1, 11))
+        # Ten pages take two poppler calls, and the bytes are written to one file for both
+        assert [c.kwargs['first_page'] for c in mock_convert.call_args_list] == [1, 9]
+        pdf_paths = {c.args[0] for c in mock_convert.call_args_list}
+        assert len(pdf_paths) == 1
+        # The temporary PDF is removed once the pages are consumed
+        assert not os.path.exists(pdf_paths.pop())
+
+    @patch('src.preprocessing.image_processor.convert_from_path', side_effect=_fake_convert_from_path)
+    @patch('src.preprocessing.image_processor.pdfinfo_from_path', return_value={"Pages": 3})
+    def test_convert_pdf_to_images_yields_pages(self, mock_info, mock_convert):
+        pages = ImageProcessor.convert_pdf_to_images("doc.pdf", first_page=2)
+
+        # Nothing is rendered until the first page is requested
+        mock_convert.assert_not_called()
+        images = list(pages)
+        assert len(images) == 2
+        assert isinstance(images[0], np.ndarray)
@@ -1,3 +1,9 @@
+import errno
+import os
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 import pytest
 import numpy as np
 from unittest.mock import MagicMock, patch
@@ -6,28 +12,27 @@ from src.ocr.tesseract_engine import TesseractEngine
 class TestOCR:
     
     @patch('src.ocr.tesseract_engine.pytesseract')
-    def test_extract_text_success(self, mock_pytesseract):
+    def test_extract_text_success(self, mock_pytesseract, dummy_image_100):
         """Test text extraction wrapper for Tesseract with valid output."""
         
-        # Setup the mock behavior for this test
-        mock_pytesseract.image_to_string.return_value = "Hello World"
-        
-        # Mock image_to_data (returns dict)
+        # Mock image_to_data (returns dict); full text is rebuilt from it
         mock_pytesseract.image_to_data.return_value = {
             'text': ['Hello', 'World', ''],
             'conf': [99, 95, -1],
             'left': [10, 60, 0],
             'top': [10, 10, 0],
             'width': [40, 40, 0],
-            'height': [20, 20, 0]
+            'height': [20, 20, 0],
+            'block_num': [1, 1, 1],
+            'par_num': [1, 1, 1],
+            'line_num': [1, 1, 1]
         }
         # Tesseract Output enum mocking - need to ensure it's accessible
         mock_pytesseract.Output.DICT = 'dict'
 
         engine = TesseractEngine()
-        dummy_image = np.zeros((100, 100, 3), dtype=np.uint8)
         
-        result = engine.extract_text(dummy_image)
+        result = engine.extract_text(dummy_image_100)
         
         assert result['text'] == "Hello World"
         assert len(result['details']) == 2
@@ -35,30 +40,181 @@ class TestOCR:
         assert result['details'][0]['text'] == "Hello"
         assert result['details'][0]['bbox']['x'] == 10
         assert result['details'][0]['confidence'] == 0.99
+        # Tesseract is invoked only once per image
+        mock_pytesseract.image_to_string.assert_not_called()
+
+    @patch('src.ocr.tesseract_engine.pytesseract')
+    def test_extract_text_rebuilds_lines(self, mock_pytesseract, dummy_image_100):
+        """Test full text is rebuilt from image_to_data line and paragraph numbers."""
+        mock_pytesseract.image_to_data.return_value = {
+            'text': ['Invoice', '#123', 'Total:', '$100.00', 'Thanks'],
+            'conf': [90, 90, 90, 90, 90],
+            'left': [0, 0, 0, 0, 0],
+            'top': [0, 0, 0, 0, 0],
+            'width': [0, 0, 0, 0, 0],
+            'height': [0, 0, 0, 0, 0],
+            'block_num': [1, 1, 1, 1, 2],
+            'par_num': [1, 1, 1, 1, 1],
+            'line_num': [1, 1, 2, 2, 1]
+        }
+
+        engine = TesseractEngine()
+        result = engine.extract_text(dummy_image_100)
+
+        assert result['text'] == "Invoice #123\nTotal: $100.00\n\nThanks"
         
     @patch('src.ocr.tesseract_engine.pytesseract')
-    def test_handling_missing_library(self, mock_pytesseract):
+    def test_extract_text_converts_to_uint8(self, mock_pytesseract):
+        """Test float images are converted to 8-bit grayscale before OCR."""
+        mock_pytesseract.image_to_data.return_value = {
+            'text': [], 'conf': [], 'left': [], 'top': [], 'width': [], 'height': [],
+            'block_num': [], 'par_num': [], 'line_num': []
+        }
+
+        engine = TesseractEngine()
+        engine.extract_text(np.full((100, 100), 300.0, dtype=np.float32))
+
+        img_obj = mock_pytesseract.image_to_data.call_args[0][0]
+        assert img_obj.mode == "L"
+        assert img_obj.getpixel((0, 0)) == 255
+
+    @patch('src.ocr.tesseract_engine.pytesseract')
+    def test_handling_missing_library(self, mock_pytesseract, dummy_image_100):
         """Test error handling when pytesseract raises ImportError."""
         
-        mock_pytesseract.image_to_string.side_effect = ImportError("No module named pytesseract")
+        mock_pytesseract.image_to_data.side_effect = ImportError("No module named pytesseract")
         
         engine = TesseractEngine()
-        dummy_image = np.zeros((100, 100, 3), dtype=np.uint8)
         
         with pytest.raises(ImportError):
-            engine.extract_text(dummy_image)
+            engine.extract_text(dummy_image_100)
 
     @patch('src.ocr.tesseract_engine.pytesseract')
-    def test_handling_missing_binary(self, mock_pytesseract):
+    def test_handling_missing_binary(self, mock_pytesseract, dummy_image_100):
         """Test error handling when Tesseract binary is missing."""
         # Create a specific exception class for TesseractNotFoundError and attach to mock
         class TesseractNotFoundError(Exception): pass
         mock_pytesseract.TesseractNotFoundError = TesseractNotFoundError
         
-        mock_pytesseract.image_to_string.side_effect = TesseractNotFoundError("tesseract is not installed")
+        mock_pytesseract.image_to_data.side_effect = TesseractNotFoundError("tesseract is not installed")
         
         engine = TesseractEngine()
-        dummy_image = np.zeros((100, 100, 3), dtype=np.uint8)
         
         with pytest.raises(TesseractNotFoundError):
-            engine.extract_text(dummy_image)
+            engine.extract_text(dummy_image_100)
+
+    @patch('src.ocr.tesseract_engine.tesserocr', None)
+    @patch('src.ocr.tesseract_engine.subprocess.run')
+    @patch('src.ocr.tesseract_engine.pytesseract')
+    def test_omp_thread_limit_passed_to_subprocess(self, mock_pytesseract, mock_run, dummy_image_100):
+        """Test omp_thread_limit is set for the tesseract process only."""
+        mock_run.return_value = MagicMock(returncode=0, stdout=(
+            "level\tpage_num\tblock_num\tpar_num\tline_num\tword_num\t"
+            "left\ttop\twidth\theight\tconf\ttext\n"
+            "5\t1\t1\t1\t1\t1\t10\t10\t40\t20\t96.5\tHello\n"
+        ).encode())
+
+        environ_before = dict(os.environ)
+        engine = TesseractEngine(omp_thread_limit=1)
+        result = engine.extract_text(dummy_image_100)
+
+        assert result['text'] == "Hello"
+        assert result['details'][0]['confidence'] == 0.965
+        assert mock_run.call_args.kwargs['env']['OMP_THREAD_LIMIT'] == "1"
+        assert dict(os.environ) == environ_before
+        mock_pytesseract.image_to_data.assert_not_called()
+
+    @patch('src.ocr.tesseract_engine.tesserocr', None)
+    @patch('src.ocr.tesseract_engine.subprocess.run')
+    @patch('src.ocr.tesseract_engine.pytesseract')
+    def test_omp_thread_limit_subprocess_errors(self, mock_pytesseract, mock_run, dummy_image_100):
+        """Test the per-process path times out and fails like pytesseract."""
+        class TesseractNotFoundError(Exception): pass
+        mock_pytesseract.TesseractNotFoundError = TesseractNotFoundError
+        engine = TesseractEngine(omp_thread_limit=1, timeout=5)
+
+        mock_run.side_effect = subprocess.TimeoutExpired("tesseract", 5)
+        with pytest.raises(RuntimeError, match="timeout"):
+            engine.extract_text(dummy_image_100)
+        assert mock_run.call_args.kwargs['timeout'] == 5
+
+        mock_run.side_effect = FileNotFoundError(errno.ENOENT, "No such file", "tesseract")
+        with pytest.raises(TesseractNotFoundError):
+            engine.extract_text(dummy_image_100)
+
+    @patch.dict(TesseractEngine._api_cache, clear=True)
+    @patch('src.ocr.tesseract_engine.pytesseract')
+    @patch('src.ocr.tesseract_engine.tesserocr')
+    def test_extract_text_with_tesserocr(self, mock_tesserocr, mock_pytesseract, dummy_image_100):
+        """Test the in-process tesserocr backend is used when available."""
+        mock_api = mock_tesserocr.PyTessBaseAPI.return_value
+        mock_api.GetTSVText.return_value = (
+            "1\t1\t0\t0\t0\t0\t0\t0\t100\t100\t-1\t\n"
+            "5\t1\t1\t1\t1\t1\t10\t10\t40\t20\t99.0\tHello\n"
+            "5\t1\t1\t1\t1\t2\t60\t10\t40\t20\t95.0\tWorld\n"
+        )
+
+        engine = TesseractEngine()
+        result = engine.extract_text(dummy_image_100)
+
+        assert result['text'] == "Hello World"
+        assert result['details'][1]['bbox'] == {"x": 60, "y": 10, "w": 40, "h": 20}
+        mock_tesserocr.PyTessBaseAPI.assert_called_once_with(lang='eng')
+        mock_pytesseract.image_to_data.assert_not_called()
+
+    @patch.dict(TesseractEngine._api_cache, clear=True)
+    @patch('src.ocr.tesseract_engine.tesserocr')
+    def test_tesserocr_api_shared_between_engines(self, mock_tesserocr):
+        """Test engines with the same settings load the tesserocr API only once."""
+        mock_tesserocr.PyTessBaseAPI.return_value.GetTSVText.return_value = ""
+        image = np.zeros((100, 100), dtype=np.uint8)
+
+        TesseractEngine().extract_text(image)
+        TesseractEngine().extract_text(image)
+        TesseractEngine(psm=6).extract_text(image)
+
+        assert mock_tesserocr.PyTessBaseAPI.call_count == 2
+
+    @patch.dict(TesseractEngine._api_cache, clear=True)
+    @patch('src.ocr.tesseract_engine.tesserocr')
+    def test_tesserocr_api_pool(self, mock_tesserocr):
+        """Test concurrent callers get separate APIs, up to pool_size."""
+        mock_tesserocr.PyTessBaseAPI.side_effect = lambda **kwargs: MagicMock()
+        engine = TesseractEngine(pool_size=2)
+
+        first = engine._acquire_api()
+        second = engine._acquire_api()
+        assert first is not second
+        engine._release_api(first)
+
+        # An idle API is reused instead of loading a third one
+        assert engine._acquire_api() is first
+        assert mock_tesserocr.PyTessBaseAPI.call_count == 2
+
+    @patch.dict(TesseractEngine._api_cache, clear=True)
+    @patch('src.ocr.tesseract_engine._API_WAIT_SECONDS', 0.01)
+    @patch('src.ocr.tesseract_engine.tesserocr')
+    def test_tesserocr_api_pool_failed_creation(self, mock_tesserocr):
+        """Test a failed API creation frees its slot instead of leaving waiters blocked."""
+        engine = TesseractEngine()
+        release_first = threading.Event()
+        api = MagicMock()
+
+        def create(**kwargs):
+            if mock_tesserocr.PyTessBaseAPI.call_count == 1:
+                release_first.wait(5)
+                raise RuntimeError("Failed to init API")
+            return api
+        mock_tesserocr.PyTessBaseAPI.side_effect = create
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            first = pool.submit(engine._acquire_api)
+            while mock_tesserocr.PyTessBaseAPI.call_count == 0:
+                time.sleep(0.001)
+            # Waits on the pool's only slot, held by the first caller's creation
+            second = pool.submit(engine._acquire_api)
+            release_first.set()
+
+            with pytest.raises(RuntimeError):
+                first.result(timeout=5)
+            assert second.result(timeout=5) is api
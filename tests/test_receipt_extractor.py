@@ -5,12 +5,12 @@ from src.extraction.document_specific.receipt_extractor import ReceiptExtractor
 # Path to the sample file we just created
 SAMPLE_PATH = os.path.join(os.path.dirname(__file__), "samples", "sample_receipt.txt")
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def receipt_text():
     with open(SAMPLE_PATH, "r") as f:
         return f.read()
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def extractor():
     return ReceiptExtractor()
 
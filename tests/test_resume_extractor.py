@@ -4,12 +4,12 @@ from src.extraction.document_specific.resume_extractor import ResumeExtractor
 
 SAMPLE_PATH = os.path.join(os.path.dirname(__file__), "samples", "sample_resume.txt")
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def resume_text():
     with open(SAMPLE_PATH, "r") as f:
         return f.read()
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def extractor():
     return ResumeExtractor()
 
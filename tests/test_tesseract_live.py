@@ -1,7 +1,39 @@
 import pytest
 import numpy as np
-from PIL import Image, ImageDraw
-from src.ocr.tesseract_engine import TesseractEngine
+from PIL import Image, ImageDraw, ImageFont
+
+pytestmark = pytest.mark.xdist_group("ocr")
+
+# Loaded once; a ~32px TrueType glyph reads far more reliably than PIL's tiny bitmap font
+try:
+    _FONT = ImageFont.truetype("DejaVuSans.ttf", 32)
+except OSError:
+    _FONT = ImageFont.load_default(size=32)
+
+@pytest.fixture(autouse=True)
+def _single_thread_tesseract(monkeypatch):
+    # On an image this small OpenMP coordination costs more than it saves.
+    # Set before the tesseract subprocess is spawned, so it inherits them. This only
+    # reaches the pytesseract backend: tesserocr's OpenMP runtime read them at import.
+    monkeypatch.setenv("OMP_THREAD_LIMIT", "1")
+    monkeypatch.setenv("OMP_NUM_THREADS", "1")
+
+@pytest.fixture(scope="session")
+def django_image():
+    """Read-only 8-bit grayscale image of the word "Django", rendered once."""
+    # White background, black text: what the pipeline feeds Tesseract.
+    # Tesseract works well on high contrast; "Django" is distinct.
+    img = Image.new('L', (300, 80), color=255)
+    ImageDraw.Draw(img).text((10, 20), "Django", fill=0, font=_FONT)
+    # Zero-copy view of the image buffer, as the pipeline input would be
+    return np.asarray(img, dtype=np.uint8)
+
+@pytest.fixture(scope="session")
+def django_image_rgb():
+    """The original case: RGB image of "Django" in PIL's default bitmap font."""
+    img = Image.new('RGB', (200, 100), color='white')
+    ImageDraw.Draw(img).text((10, 40), "Django", fill='black')
+    return np.asarray(img)
 
 class TestTesseractLive:
     """
@@ -9,34 +41,16 @@ class TestTesseractLive:
     Requires 'tesseract' to be installed on the system (e.g. brew install tesseract).
     """
 
-    def test_live_extraction(self):
-        # 1. Create a simple image with text "HELLO"
-        # White background, black text
-        img = Image.new('RGB', (200, 100), color='white')
-        d = ImageDraw.Draw(img)
-        # Using default font (usually tiny), potentially hard for OCR if too small?
-        # Let's try to verify simple text. 
-        # Without a font path, PIL uses a bitmap font. "HELLO" might be small.
-        # So we just write it and hope or use a simple pattern.
-        # Better: Tesseract works well on high contrast.
-        d.text((10, 40), "Django", fill='black') # "Django" is distinct
-        
-        # Convert to numpy for the engine (simulating real pipeline input)
-        img_np = np.array(img)
-
-        # 2. Initialize Engine
-        try:
-            engine = TesseractEngine()
-        except Exception as e:
-            pytest.fail(f"Could not initialize TesseractEngine. Is pytesseract installed? Error: {e}")
+    @pytest.mark.parametrize("image_fixture", ["django_image_rgb", "django_image"])
+    def test_live_extraction(self, tess_engine, image_fixture, request):
+        image = request.getfixturevalue(image_fixture)
 
-        # 3. Run Extraction
+        # 1. Run Extraction
         try:
-            result = engine.extract_text(img_np)
+            result = tess_engine.extract_text(image)
             text = result['text'].strip()
-            print(f"Extracted Text: '{text}'")
             
-            # 4. Assert
+            # 2. Assert
             # Allows for some noise, but "Django" should be there
             assert "Django" in text or "uiango" in text # common OCR misreads for default font
             
@@ -14,12 +14,14 @@ class TestFieldValidator:
         # Use a real looking fake num
         assert FieldValidator.validate_phone_number("+1 650 253 0000") is True
         assert FieldValidator.validate_phone_number("123") is False
+        assert FieldValidator.validate_phone_number("(150) 253-0000") is False # Area codes never start with 0/1
         
     def test_validate_date(self):
         assert FieldValidator.validate_date("2023-01-01") is True
         assert FieldValidator.validate_date("1800-01-01") is False # Too old
         assert FieldValidator.validate_date("3000-01-01") is False # Too future
         assert FieldValidator.validate_date("invalid") is False
+        assert FieldValidator.validate_date("20230101") is False # Only YYYY-MM-DD is accepted
         
     def test_validate_amount(self):
         assert FieldValidator.validate_amount(100.50) is True
@@ -49,6 +51,60 @@ class TestInvoiceValidator:
         assert res["valid"] is False
         assert "Total mismatch" in res["errors"][0]
 
+    def test_validate_totals_exact_at_tolerance(self):
+        # In binary floats 1.1 + 2.2 - 3.25 is just over 0.05
+        data = {
+            "subtotal": {"value": 1.1},
+            "tax": {"value": 2.2},
+            "total_amount": {"value": 3.25}
+        }
+        assert InvoiceValidator.validate_totals(data)["valid"] is True
+        assert InvoiceValidator.validate_totals(data, tolerance=0.04)["valid"] is False
+
+    def test_validate_totals_non_finite(self):
+        inf_data = {"subtotal": {"value": "inf"}, "total_amount": {"value": "inf"}}
+        assert InvoiceValidator.validate_totals(inf_data)["valid"] is False
+        assert CrossFieldValidator.validate(inf_data, "invoice").document_valid is False
+
+        nan_tax = {"subtotal": {"value": 100.0}, "tax": {"value": "nan"}, "total_amount": {"value": 100.0}}
+        assert InvoiceValidator.validate_totals(nan_tax)["valid"] is False
+        # A NaN subtotal is treated like a missing one
+        nan_subtotal = {"subtotal": {"value": "nan"}, "total_amount": {"value": 100.0}}
+        assert InvoiceValidator.validate_totals(nan_subtotal)["valid"] is True
+
+        # The batch path agrees on the same three invoices
+        valid = InvoiceValidator.validate_totals_batch(
+            subtotals=[float("inf"), 100.0, float("nan")],
+            taxes=[0.0, float("nan"), 0.0],
+            shippings=[0.0, 0.0, 0.0],
+            discounts=[0.0, 0.0, 0.0],
+            totals=[float("inf"), 100.0, 100.0]
+        )
+        assert valid.tolist() == [False, False, True]
+
+    def test_validate_totals_batch(self):
+        valid = InvoiceValidator.validate_totals_batch(
+            subtotals=[100.0, 100.0, 0.0],
+            taxes=[10.0, 10.0, 5.0],
+            shippings=[5.0, 0.0, 0.0],
+            discounts=[0.0, 0.0, 0.0],
+            totals=[115.0, 150.0, 999.0]
+        )
+        # Third invoice has no subtotal, so it is not checked
+        assert valid.tolist() == [True, False, True]
+
+    def test_validate_totals_batch_tolerance(self):
+        valid = InvoiceValidator.validate_totals_batch(
+            subtotals=[100.0, 100.0],
+            taxes=[0.0, 0.0],
+            shippings=[0.0, 0.0],
+            discounts=[0.0, 0.0],
+            totals=[100.04, 100.06],
+            tolerance=0.05
+        )
+        # Tolerance is absolute, matching validate_totals
+        assert valid.tolist() == [True, False]
+
     def test_validate_dates(self):
         data = {
             "invoice_date": {"value": "2023-01-01"},
@@ -70,8 +126,8 @@ class TestCrossFieldValidator:
             "due_date": {"value": "2023-02-01"}
         }
         report = CrossFieldValidator.validate(data, "invoice")
-        assert report["document_valid"] is True
-        assert report["field_validations"]["total_amount"] is True
+        assert report.document_valid is True
+        assert report.field_validations["total_amount"] is True
         
     def test_validate_invoice_invalid(self):
         data = {
@@ -80,5 +136,6 @@ class TestCrossFieldValidator:
             "total_amount": {"value": "999.00"} # Invalid Logic
         }
         report = CrossFieldValidator.validate(data, "invoice")
-        assert report["document_valid"] is False
-        assert len(report["logic_validations"]) > 0
+        assert report.document_valid is False
+        assert len(report.logic_validations) > 0
+        assert report.to_dict()["logic_validations"] == report.logic_validations